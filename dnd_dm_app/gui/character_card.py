@@ -5,12 +5,172 @@ Componente de tarjeta de personaje para mostrar información individual
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                               QGridLayout, QPushButton, QFrame, QSpinBox,
                               QComboBox, QCheckBox, QGroupBox, QFormLayout)
-from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QPixmap, QFont, QPainter, QColor
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer, QObject
+from PySide6.QtGui import (QPixmap, QPixmapCache, QFont, QPainter, QColor,
+                           QStandardItemModel, QStandardItem)
 
-from models.character import Character
+import os
+import functools
+from typing import Optional
+
+from models.character import Character, DndClass
 from utils.image_utils import ImageUtils
-from utils.theme import get_character_card_style
+from utils import layout_math
+
+
+# Cache de pixmaps compartido por todas las tarjetas (límite en KB a escala 1x)
+_PIXMAP_CACHE_KB = 65536
+QPixmapCache.setCacheLimit(_PIXMAP_CACHE_KB)
+
+# Retratos en decodificación: clave de cache -> callbacks en espera
+_pending_loads = {}
+# Archivos ("ruta|mtime") cuya decodificación falló, a cualquier tamaño (si el
+# archivo cambia, su mtime también y se vuelve a intentar)
+_failed_loads = set()
+
+# Fuentes compartidas por todas las tarjetas (se crean al construir la primera,
+# cuando ya existe la QApplication)
+_NAME_FONT = None
+_CLASS_FONT = None
+_STAT_LABEL_FONT = None
+_STAT_VALUE_FONT = None
+_STAT_MOD_FONT = None
+
+
+# Size hints constantes (Qt los consulta muchas veces por cada pasada de layout)
+_SIZE_HINT = QSize(240, 320)
+_MIN_SIZE_HINT = QSize(240, 320)
+
+# Texto precalculado de los modificadores D&D (rango acotado: stats 1-30 -> -5..+10)
+_MOD_STR = {i: (f"+{i}" if i >= 0 else str(i)) for i in range(-10, 21)}
+
+# Modelo de skills/stats compartido (solo lectura) por los combos de todas las tarjetas
+_SKILL_COMBO_MODEL = None
+
+
+def _make_font(point_size: int, bold: bool = False, italic: bool = False) -> QFont:
+    """Crear una fuente con tamaño y estilo dados"""
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setBold(bold)
+    font.setItalic(italic)
+    return font
+
+
+def _init_fonts():
+    """Inicializar las fuentes compartidas una sola vez"""
+    global _NAME_FONT, _CLASS_FONT, _STAT_LABEL_FONT, _STAT_VALUE_FONT, _STAT_MOD_FONT
+    if _NAME_FONT is not None:
+        return
+    
+    _NAME_FONT = _make_font(11, bold=True)
+    _CLASS_FONT = _make_font(9, italic=True)
+    _STAT_LABEL_FONT = _make_font(8, bold=True)
+    _STAT_VALUE_FONT = _make_font(10, bold=True)
+    _STAT_MOD_FONT = _make_font(8)
+
+
+def _ensure_cache_limit(dpr: float):
+    """Ampliar el límite del cache en proporción a dpr² (pixmaps HiDPI ocupan más)"""
+    limit = int(_PIXMAP_CACHE_KB * max(1.0, dpr * dpr))
+    if limit > QPixmapCache.cacheLimit():
+        QPixmapCache.setCacheLimit(limit)
+
+
+def _request_pixmap(path: str, size: tuple, dpr: float, on_ready) -> tuple:
+    """
+    Obtener el retrato escalado desde el cache o pedir su carga en segundo plano
+    
+    Si no está en cache, la decodificación se hace en el pool de hilos
+    (ImageUtils.load_pixmap_async) y on_ready recibe el QPixmap al terminar (None si
+    falla). Varias peticiones de la misma imagen y tamaño comparten una sola
+    decodificación; las que fallaron no se vuelven a enviar.
+    
+    Args:
+        path: Ruta de la imagen
+        size: Tamaño objetivo en píxeles lógicos (ancho, alto)
+        dpr: Device pixel ratio de la pantalla destino
+        on_ready: Callback que recibe el QPixmap cuando la carga termina
+        
+    Returns:
+        (pixmap, pendiente): el QPixmap escalado a píxeles físicos si ya estaba en
+        cache; si no, None y si on_ready será llamado (False si la imagen no existe
+        o ya falló antes)
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None, False
+    
+    file_key = f"{path}|{mtime}"
+    if file_key in _failed_loads:
+        return None, False
+    
+    width, height = round(size[0] * dpr), round(size[1] * dpr)
+    key = f"{file_key}|{width}x{height}@{dpr}"
+    pixmap = QPixmap()
+    if QPixmapCache.find(key, pixmap):
+        return pixmap, False
+    
+    waiting = _pending_loads.get(key)
+    if waiting is not None:
+        waiting.append(on_ready)
+        return None, True
+    _pending_loads[key] = [on_ready]
+    
+    def deliver(loaded: QPixmap):
+        callbacks = _pending_loads.pop(key, ())
+        if loaded is None:
+            _failed_loads.add(file_key)
+        else:
+            loaded.setDevicePixelRatio(dpr)
+            QPixmapCache.insert(key, loaded)
+        for callback in callbacks:
+            callback(loaded)
+    
+    ImageUtils.load_pixmap_async(path, (width, height), deliver)
+    return None, True
+
+
+def _cached_placeholder(size: tuple, dpr: float = 1.0) -> QPixmap:
+    """Obtener el placeholder de retrato desde el cache (clave solo por tamaño)"""
+    width, height = round(size[0] * dpr), round(size[1] * dpr)
+    key = f"placeholder|{width}x{height}@{dpr}"
+    pixmap = QPixmap()
+    if QPixmapCache.find(key, pixmap):
+        return pixmap
+    
+    pixmap = ImageUtils.create_placeholder_pixmap((width, height), "D&D\nSin Imagen")
+    pixmap.setDevicePixelRatio(dpr)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class CardActionRouter(QObject):
+    """
+    Enrutador para los botones de acción de las tarjetas de un grid
+    Lee el ID del personaje y la acción desde las propiedades del botón emisor
+    
+    Cada CharacterGrid tiene el suyo y lo pasa a sus tarjetas: un clic solo llega
+    al grid dueño de la tarjeta.
+    """
+    
+    edit_requested = Signal(str)  # Emite el ID del personaje
+    delete_requested = Signal(str)  # Emite el ID del personaje
+    
+    @Slot()
+    def route(self):
+        """Reenviar el clic de un botón de tarjeta como señal de edición/eliminación"""
+        button = self.sender()
+        if button is None:
+            return
+        
+        card_id = button.property("card_id")
+        action = button.property("action")
+        if action == "edit":
+            self.edit_requested.emit(card_id)
+        elif action == "delete":
+            self.delete_requested.emit(card_id)
 
 
 class CharacterCard(QFrame):
@@ -20,14 +180,66 @@ class CharacterCard(QFrame):
     """
     
     # Señales para comunicación con el widget padre
-    edit_requested = Signal(str)  # Emite el ID del personaje
-    delete_requested = Signal(str)  # Emite el ID del personaje
+    # (editar/eliminar se emiten desde el CardActionRouter del grid dueño de la tarjeta)
     roll_calculated = Signal(dict)  # Emite el resultado completo del cálculo
     
-    def __init__(self, character: Character, parent=None):
+    @classmethod
+    def _get_skill_model(cls) -> QStandardItemModel:
+        """
+        Obtener el modelo compartido con los stats y skills para el combo de tiradas
+        
+        Returns:
+            Modelo construido una sola vez y reutilizado por todas las tarjetas
+        """
+        global _SKILL_COMBO_MODEL
+        if _SKILL_COMBO_MODEL is not None:
+            return _SKILL_COMBO_MODEL
+        
+        model = QStandardItemModel()
+        
+        # Agregar stats directos
+        for stat in Character.STATS:
+            item = QStandardItem(f"{stat} (Stat)")
+            item.setData(stat, Qt.ItemDataRole.UserRole)
+            model.appendRow(item)
+        
+        # Separador visual (mismo marcador que usa QComboBox.insertSeparator)
+        separator = QStandardItem()
+        separator.setData("separator", Qt.ItemDataRole.AccessibleDescriptionRole)
+        separator.setFlags(Qt.ItemFlag.NoItemFlags)
+        model.appendRow(separator)
+        
+        # Agregar skills organizadas
+        for stat in Character.STATS:
+            for skill in Character.SKILLS[stat]:
+                item = QStandardItem(f"{skill} ({stat})")
+                item.setData(skill, Qt.ItemDataRole.UserRole)
+                model.appendRow(item)
+        
+        _SKILL_COMBO_MODEL = model
+        return model
+    
+    def __init__(self, character: Character, router: Optional[CardActionRouter] = None, parent=None):
         super().__init__(parent)
         self.character = character
-        self.image_utils = ImageUtils()
+        # Enrutador de editar/eliminar (sin grid: uno propio de la tarjeta)
+        self.action_router = router if router is not None else CardActionRouter(self)
+        
+        # Último tamaño de imagen cuantizado (evita reescalados redundantes)
+        self._last_image_bucket = None
+        # Último (ancho, alto, imagen) aplicado por update_card_size
+        self._last_size_state = None
+        # Últimos argumentos recibidos por update_card_size
+        self._last_size_args = None
+        
+        # Ruta del retrato mostrado actualmente (None si se muestra el placeholder)
+        self._shown_image_path = None
+        
+        # Timer para recargar la imagen solo cuando el resize se estabiliza
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(80)
+        self._reload_timer.timeout.connect(self._load_character_image)
         
         self.setFrameStyle(QFrame.Shape.StyledPanel)
         self.setFrameShadow(QFrame.Shadow.Raised)
@@ -39,11 +251,17 @@ class CharacterCard(QFrame):
         
         self._setup_ui()
         
-        # Aplicar tema de tarjetas oscuras
-        self.setStyleSheet(get_character_card_style())
+        # El tema de tarjetas oscuras se aplica una sola vez en el contenedor del grid
+        # (ver CharacterGrid._setup_ui), no por tarjeta
+        
+        # Programar la primera carga de imagen; si el grid llama a update_card_size
+        # antes de que venza el timer, ambas cargas se combinan en una sola
+        self._reload_timer.start()
     
     def _setup_ui(self):
         """Configurar la interfaz de usuario de la tarjeta"""
+        _init_fonts()
+        
         layout = QVBoxLayout(self)
         layout.setSpacing(8)  # Espaciado más generoso
         layout.setContentsMargins(12, 12, 12, 12)  # Márgenes ligeramente más grandes
@@ -59,18 +277,14 @@ class CharacterCard(QFrame):
         
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setMinimumSize(50, 50)
-        self.image_label.setScaledContents(True)
-        self._load_character_image()
+        self.image_label.setMinimumSize(48, 48)
+        # Placeholder inmediato; la imagen real se carga cuando el tamaño se estabiliza
+        self.image_label.setPixmap(_cached_placeholder((72, 72), self.devicePixelRatioF()))
         
         image_container_layout.addWidget(self.image_label)
         
-        # Centrar imagen en la tarjeta
-        image_layout = QHBoxLayout()
-        image_layout.addStretch()
-        image_layout.addWidget(self.image_container)
-        image_layout.addStretch()
-        layout.addLayout(image_layout)
+        # Centrar imagen en la tarjeta (alineación directa, sin layout ni stretches extra)
+        layout.addWidget(self.image_container, 0, Qt.AlignmentFlag.AlignHCenter)
         
         # === NOMBRE DEL PERSONAJE ===
         self.name_label = QLabel(self.character.name)
@@ -79,29 +293,27 @@ class CharacterCard(QFrame):
         self.name_label.setMaximumHeight(40)  # Limitar altura
         
         # Configurar fuente del nombre
-        name_font = QFont()
-        name_font.setPointSize(11)
-        name_font.setBold(True)
-        self.name_label.setFont(name_font)
+        self.name_label.setFont(_NAME_FONT)
         
         layout.addWidget(self.name_label)
         
         # === CLASE Y STATS ===
-        class_label = QLabel(f"Clase: {getattr(self.character, 'character_class', 'Fighter')}")
-        class_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        class_font = QFont()
-        class_font.setPointSize(9)
-        class_font.setItalic(True)
-        class_label.setFont(class_font)
-        layout.addWidget(class_label)
+        # Character siempre define character_class (por defecto 'Fighter')
+        self.class_label = QLabel(f"Clase: {self.character.character_class}")
+        self.class_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.class_label.setFont(_CLASS_FONT)
+        layout.addWidget(self.class_label)
         
         # === STATS Y MODIFICADORES ===
         stats_widget = self._create_stats_widget()
         layout.addWidget(stats_widget)
         
         # === SECCIÓN DE TIRADAS ===
-        roll_widget = self._create_roll_widget()
-        layout.addWidget(roll_widget)
+        # Se construye bajo demanda: hasta el primer clic solo hay un botón
+        self._roll_placeholder = QPushButton("🎲 Tirada D&D")
+        self._roll_placeholder.setToolTip("Mostrar calculadora de tiradas")
+        self._roll_placeholder.clicked.connect(self._materialize_roll_widget)
+        layout.addWidget(self._roll_placeholder)
         
         # Espaciador flexible para empujar los botones hacia abajo
         layout.addStretch(1)
@@ -114,16 +326,15 @@ class CharacterCard(QFrame):
         """Actualizar el tamaño de la tarjeta basado en el espacio disponible - flexbox completo"""
         if cards_in_row <= 0:
             return
-            
-        # Calcular ancho disponible por tarjeta
-        spacing = 15  # Espacio entre tarjetas
-        margin = 40   # Márgenes laterales total
-        
-        total_spacing = (cards_in_row - 1) * spacing
-        card_width = (available_width - margin - total_spacing) // cards_in_row
         
-        # Limitar el ancho mínimo y máximo
-        card_width = max(200, min(400, card_width))
+        # Mismos argumentos que la última vez: la geometría resultante sería idéntica
+        size_args = (available_width, cards_in_row, available_height)
+        if size_args == self._last_size_args:
+            return
+        self._last_size_args = size_args
+            
+        # Ancho por tarjeta, limitado a [200, 400] (cacheado: igual para toda la fila)
+        card_width = layout_math.card_width(available_width, cards_in_row)
         
         # Calcular altura flexible - MAXIMIZAR espacio vertical disponible
         base_height = max(300, int(card_width * 1.2))  # Altura base más generosa
@@ -136,14 +347,23 @@ class CharacterCard(QFrame):
             # Sin limitación de altura, usar un tamaño generoso
             card_height = max(base_height, min(600, int(card_width * 1.6)))
         
+        # Tamaño de imagen proporcional, cuantizado a múltiplos de 16px
+        # para que resizes consecutivos reutilicen el mismo pixmap cacheado
+        image_size = (int(max(50, min(150, card_width * 0.3))) // 16) * 16
+        
+        # Si nada cambió, evitar las escrituras de geometría (cada una invalida el layout)
+        size_state = (card_width, card_height, image_size)
+        if size_state == self._last_size_state:
+            return
+        self._last_size_state = size_state
+        
         # Actualizar tamaño de la tarjeta
         self.setFixedWidth(card_width)
         self.setMaximumHeight(card_height)
         self.setMinimumHeight(min(250, card_height))
         
-        # Actualizar tamaño de imagen proporcionalmente
-        image_size = max(50, min(150, card_width * 0.3))
-        self.image_label.setFixedSize(int(image_size), int(image_size))
+        # Actualizar tamaño de imagen
+        self.image_label.setFixedSize(image_size, image_size)
         
         # También actualizar el contenedor de imagen
         container_size = image_size + 8  # 4px padding en cada lado
@@ -158,32 +378,63 @@ class CharacterCard(QFrame):
             self.edit_button.setMinimumWidth(int(min_button_width))
             self.delete_button.setMinimumWidth(int(min_button_width))
         
-        # Recargar imagen con nuevo tamaño
-        self._load_character_image()
+        # Recargar imagen solo si cambió el tamaño cuantizado (diferido con debounce)
+        if image_size == self._last_image_bucket:
+            return
+        self._last_image_bucket = image_size
+        # Vista previa rápida estirando el pixmap actual hasta que llegue el definitivo
+        self.image_label.setScaledContents(True)
+        self._reload_timer.start()
     
     def _load_character_image(self):
         """Cargar la imagen del personaje o mostrar placeholder"""
-        # Tamaño dinámico basado en el tamaño actual del contenedor
-        current_size = self.image_label.size()
-        target_size = (max(72, current_size.width()), max(72, current_size.height()))
-        
-        if self.character.image_path:
-            pixmap = ImageUtils.load_pixmap(
-                self.character.image_path, 
-                target_size
-            )
+        # Tamaño cuantizado asignado por update_card_size (72px hasta el primer ajuste)
+        side = self._last_image_bucket or 72
+        target_size = (side, side)
+        
+        # Escalar directamente a píxeles físicos para que Qt pinte 1:1 en HiDPI
+        dpr = self.devicePixelRatioF()
+        _ensure_cache_limit(dpr)
+        
+        image_path = self.character.image_path
+        if image_path:
+            pixmap, pending = _request_pixmap(image_path, target_size, dpr,
+                                              functools.partial(self._on_image_loaded, image_path, side))
         else:
-            pixmap = None
+            pixmap, pending = None, False
+        
+        if pending and self._shown_image_path == image_path:
+            # Mismo retrato a otro tamaño: mantener el actual estirado (vista previa
+            # de update_card_size) hasta que _on_image_loaded lo reemplace
+            self.image_label.setScaledContents(True)
+            return
         
+        self._show_portrait(image_path if pixmap else None, pixmap, target_size, dpr)
+    
+    def _show_portrait(self, image_path, pixmap, target_size: tuple, dpr: float):
+        """Mostrar el retrato (ya escalado) o el placeholder si pixmap es None"""
+        # El pixmap ya llega escalado: no volver a escalarlo en cada paint
+        self.image_label.setScaledContents(False)
         if pixmap:
             self.image_label.setPixmap(pixmap)
         else:
-            # Crear placeholder responsivo
-            placeholder = ImageUtils.create_placeholder_pixmap(
-                target_size, 
-                "D&D\nSin Imagen"
-            )
-            self.image_label.setPixmap(placeholder)
+            # Placeholder responsivo (también cacheado por tamaño) mientras se
+            # decodifica el retrato o si no hay imagen
+            self.image_label.setPixmap(_cached_placeholder(target_size, dpr))
+        self._shown_image_path = image_path
+    
+    def _on_image_loaded(self, image_path: str, side: int, pixmap: QPixmap):
+        """Mostrar el retrato decodificado en segundo plano si sigue vigente"""
+        # Descartar resultados viejos (cambió la imagen o el tamaño mientras tanto)
+        if image_path != self.character.image_path or side != (self._last_image_bucket or 72):
+            return
+        try:
+            # Si la decodificación falló se muestra el placeholder
+            self._show_portrait(image_path if pixmap else None, pixmap,
+                                (side, side), self.devicePixelRatioF())
+        except RuntimeError:
+            # La tarjeta se destruyó antes de que terminara la carga
+            pass
     
     def _create_stats_widget(self) -> QWidget:
         """
@@ -198,59 +449,65 @@ class CharacterCard(QFrame):
         stats_widget.setFixedHeight(80)  # Altura fija para consistencia
         
         layout = QGridLayout(stats_widget)
-        layout.setSpacing(2)
+        layout.setHorizontalSpacing(2)
+        layout.setVerticalSpacing(0)
         layout.setContentsMargins(6, 4, 6, 4)
         
-        # Organizar stats en 3 columnas x 2 filas para mejor uso del espacio
-        positions = [
-            (0, 0), (0, 1), (0, 2),  # Primera fila: STR, DEX, CON
-            (1, 0), (1, 1), (1, 2)   # Segunda fila: INT, WIS, CHA
-        ]
+        # Referencias a los labels para actualizarlos sin recrear el widget
+        self._stat_value_labels = {}
+        self._stat_mod_labels = {}
         
+        # Organizar stats en 3 columnas x 2 bandas (STR/DEX/CON arriba, INT/WIS/CHA abajo).
+        # Cada banda ocupa 3 filas del grid: nombre, valor y modificador
         for i, stat in enumerate(Character.STATS):
-            row, col = positions[i]
-            
-            # Contenedor para cada stat
-            stat_container = QFrame()
-            stat_layout = QVBoxLayout(stat_container)
-            stat_layout.setSpacing(0)
-            stat_layout.setContentsMargins(2, 2, 2, 2)
+            base_row = (i // 3) * 3
+            col = i % 3
             
             # Label del stat (ej: "STR")
             stat_label = QLabel(stat)
             stat_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            stat_font = QFont()
-            stat_font.setBold(True)
-            stat_font.setPointSize(8)
-            stat_label.setFont(stat_font)
+            stat_label.setFont(_STAT_LABEL_FONT)
             
             # Label del valor y modificador (ej: "16" y "(+3)")
             value = self.character.get_stat(stat)
-            modifier = self.character.get_modifier(stat)
-            modifier_str = f"+{modifier}" if modifier >= 0 else str(modifier)
+            modifier_str = _MOD_STR[self.character.get_modifier(stat)]
             
             value_label = QLabel(str(value))
             value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            value_font = QFont()
-            value_font.setPointSize(10)
-            value_font.setBold(True)
-            value_label.setFont(value_font)
+            value_label.setFont(_STAT_VALUE_FONT)
             
             mod_label = QLabel(f"({modifier_str})")
             mod_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            mod_font = QFont()
-            mod_font.setPointSize(8)
-            mod_label.setFont(mod_font)
+            mod_label.setFont(_STAT_MOD_FONT)
             
-            # Ensamblar
-            stat_layout.addWidget(stat_label)
-            stat_layout.addWidget(value_label)
-            stat_layout.addWidget(mod_label)
+            self._stat_value_labels[stat] = value_label
+            self._stat_mod_labels[stat] = mod_label
             
-            layout.addWidget(stat_container, row, col)
+            # Ensamblar directamente en el grid, sin contenedores intermedios
+            layout.addWidget(stat_label, base_row, col)
+            layout.addWidget(value_label, base_row + 1, col)
+            layout.addWidget(mod_label, base_row + 2, col)
         
         return stats_widget
     
+    def _materialize_roll_widget(self):
+        """Reemplazar el botón placeholder por el widget de tiradas real"""
+        placeholder = self._roll_placeholder
+        if placeholder is None:
+            return
+        self._roll_placeholder = None
+        
+        layout = self.layout()
+        index = layout.indexOf(placeholder)
+        layout.removeWidget(placeholder)
+        placeholder.deleteLater()
+        
+        roll_widget = self._create_roll_widget()
+        layout.insertWidget(index, roll_widget)
+        
+        # Mostrar un primer resultado con los valores por defecto
+        self._calculate_roll()
+    
     def _create_roll_widget(self) -> QGroupBox:
         """Crear widget para el sistema de tiradas"""
         roll_group = QGroupBox("Tiradas D&D")
@@ -271,34 +528,21 @@ class CharacterCard(QFrame):
         
         # Dropdown para skill/stat
         self.skill_combo = QComboBox()
-        # Agregar stats directos
-        for stat in Character.STATS:
-            self.skill_combo.addItem(f"{stat} (Stat)", stat)
-        
-        # Agregar separador visual y skills
-        self.skill_combo.insertSeparator(len(Character.STATS))
-        
-        # Agregar skills organizadas
-        for stat in Character.STATS:
-            skills = Character.SKILLS[stat]
-            for skill in skills:
-                self.skill_combo.addItem(f"{skill} ({stat})", skill)
+        self.skill_combo.setModel(CharacterCard._get_skill_model())
         
         form_layout.addRow("Skill/Stat:", self.skill_combo)
         
         # Checkbox de expertise (solo para Rogue)
         self.expertise_checkbox = QCheckBox("+2 Expertise")
         self.expertise_checkbox.setToolTip("Solo disponible para clase Rogue")
-        # Habilitar solo si es Rogue
-        is_rogue = getattr(self.character, 'character_class', 'Fighter') == 'Rogue'
-        self.expertise_checkbox.setEnabled(is_rogue)
-        if not is_rogue:
-            self.expertise_checkbox.setVisible(False)
         
         form_layout.addRow("", self.expertise_checkbox)
         
         roll_layout.addLayout(form_layout)
         
+        # Ya con padre (roll_group): mostrarlo no lo convierte en ventana propia
+        self._refresh_expertise_checkbox()
+        
         # Botón calcular
         calculate_button = QPushButton("Calcular Tirada")
         calculate_button.clicked.connect(self._calculate_roll)
@@ -315,6 +559,13 @@ class CharacterCard(QFrame):
         
         return roll_group
     
+    def _refresh_expertise_checkbox(self):
+        """Mostrar y habilitar el checkbox de expertise solo si el personaje es Rogue"""
+        is_rogue = self.character.class_id == DndClass.ROGUE
+        self.expertise_checkbox.setChecked(False)
+        self.expertise_checkbox.setEnabled(is_rogue)
+        self.expertise_checkbox.setVisible(is_rogue)
+    
     def _calculate_roll(self):
         """Calcular el resultado de la tirada con todos los modificadores"""
         try:
@@ -328,19 +579,22 @@ class CharacterCard(QFrame):
             
             # Formatear resultado para mostrar
             skill_name = self.skill_combo.currentText().split(' (')[0]
-            result_text = f"🎯 TIRADA: {skill_name}\n"
-            result_text += f"Dado: {result['dice_result']}\n"
-            result_text += f"Modificador {result['base_stat']}: {result['stat_modifier']:+d}\n"
+            lines = [
+                f"🎯 TIRADA: {skill_name}",
+                f"Dado: {result['dice_result']}",
+                f"Modificador {result['base_stat']}: {_MOD_STR[result['stat_modifier']]}",
+            ]
             
             if result['proficiency_bonus'] > 0:
-                result_text += f"Proficiency: {result['proficiency_bonus']:+d}\n"
+                lines.append(f"Proficiency: {_MOD_STR[result['proficiency_bonus']]}")
             
             if result['expertise_bonus'] > 0:
-                result_text += f"Expertise: {result['expertise_bonus']:+d}\n"
-                
-            result_text += f"\n🎲 TOTAL: {result['total']}"
+                lines.append(f"Expertise: {_MOD_STR[result['expertise_bonus']]}")
+            
+            lines.append("")
+            lines.append(f"🎲 TOTAL: {result['total']}")
             
-            self.result_label.setText(result_text)
+            self.result_label.setText("\n".join(lines))
             
             # Emitir señal con resultado completo
             result['character_name'] = self.character.name
@@ -361,13 +615,18 @@ class CharacterCard(QFrame):
         buttons_layout.setSpacing(8)  # Espaciado entre botones
         buttons_layout.setContentsMargins(0, 8, 0, 0)  # Margen superior
         
+        # Los clics se enrutan por el slot del enrutador del grid
+        router = self.action_router
+        
         # Botón Editar - flexbox horizontal con altura fija
         self.edit_button = QPushButton("Editar")
         self.edit_button.setFixedHeight(40)  # Altura fija razonable
         self.edit_button.setMinimumWidth(60)  # Ancho mínimo
         # El ancho se expandirá automáticamente (flexbox)
         self.edit_button.setToolTip("Editar personaje")
-        self.edit_button.clicked.connect(self._on_edit_clicked)
+        self.edit_button.setProperty("card_id", self.character.id)
+        self.edit_button.setProperty("action", "edit")
+        self.edit_button.clicked.connect(router.route)
         
         # Botón Eliminar - flexbox horizontal con altura fija
         self.delete_button = QPushButton("Eliminar")
@@ -375,7 +634,9 @@ class CharacterCard(QFrame):
         self.delete_button.setMinimumWidth(60)  # Ancho mínimo
         # El ancho se expandirá automáticamente (flexbox)
         self.delete_button.setToolTip("Eliminar personaje")
-        self.delete_button.clicked.connect(self._on_delete_clicked)
+        self.delete_button.setProperty("card_id", self.character.id)
+        self.delete_button.setProperty("action", "delete")
+        self.delete_button.clicked.connect(router.route)
         
         # Layout flexbox - los botones se expanden horizontalmente
         buttons_layout.addWidget(self.edit_button)
@@ -386,14 +647,6 @@ class CharacterCard(QFrame):
         # Los estilos ahora se aplican centralizadamente desde el tema
         pass
     
-    def _on_edit_clicked(self):
-        """Manejar clic en botón editar"""
-        self.edit_requested.emit(self.character.id)
-    
-    def _on_delete_clicked(self):
-        """Manejar clic en botón eliminar"""
-        self.delete_requested.emit(self.character.id)
-    
     def update_character(self, character: Character):
         """
         Actualizar la tarjeta con nueva información del personaje
@@ -403,23 +656,22 @@ class CharacterCard(QFrame):
         """
         self.character = character
         
-        # Actualizar nombre
+        # Actualizar nombre y clase
         self.name_label.setText(character.name)
+        self.class_label.setText(f"Clase: {character.character_class}")
+        
+        # El widget de tiradas solo existe si ya se materializó
+        if self._roll_placeholder is None:
+            self._refresh_expertise_checkbox()
         
         # Recargar imagen
         self._load_character_image()
         
-        # Recrear widget de stats
-        # Primero remover el widget anterior
-        layout = self.layout()
-        stats_widget = layout.itemAt(2).widget()  # El widget de stats está en posición 2
-        if stats_widget:
-            stats_widget.deleteLater()
-            layout.removeWidget(stats_widget)
-        
-        # Crear nuevo widget de stats
-        new_stats_widget = self._create_stats_widget()
-        layout.insertWidget(2, new_stats_widget)
+        # Actualizar stats reutilizando los labels existentes
+        for stat in Character.STATS:
+            modifier_str = _MOD_STR[character.get_modifier(stat)]
+            self._stat_value_labels[stat].setText(str(character.get_stat(stat)))
+            self._stat_mod_labels[stat].setText(f"({modifier_str})")
     
     def get_character_id(self) -> str:
         """
@@ -432,8 +684,8 @@ class CharacterCard(QFrame):
     
     def sizeHint(self) -> QSize:
         """Sugerir tamaño óptimo para la tarjeta"""
-        return QSize(240, 320)
+        return _SIZE_HINT
         
     def minimumSizeHint(self) -> QSize:
         """Tamaño mínimo de la tarjeta"""
-        return QSize(240, 320)
\ No newline at end of file
+        return _MIN_SIZE_HINT
\ No newline at end of file
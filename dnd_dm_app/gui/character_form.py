@@ -6,13 +6,60 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                               QLineEdit, QSpinBox, QPushButton, QLabel, QFrame,
                               QFileDialog, QMessageBox, QGridLayout, QGroupBox,
                               QComboBox, QCheckBox, QScrollArea, QWidget)
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QSignalBlocker, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QFont, QPixmap
 
 from models.character import Character, validate_character_data
 from utils.image_utils import ImageUtils
 from utils.theme import get_character_form_style
+import functools
 import os
+import random
+from sys import intern
+
+
+# Texto del modificador D&D precalculado para cada valor de stat válido
+_MOD_STR_CACHE = {
+    value: f"(+{(value - 10) // 2})" if value >= 10 else f"({(value - 10) // 2})"
+    for value in range(Character.MIN_STAT, Character.MAX_STAT + 1)
+}
+
+# Caras de un d6 para las tiradas de stats aleatorios
+_D6_FACES = range(1, 7)
+
+@functools.lru_cache(maxsize=32)
+def _cached_pixmap(path: str, mtime_ns: int, width: int, height: int):
+    """
+    Cargar la vista previa de una imagen con cache por (ruta, mtime, tamaño)
+    
+    El mtime forma parte de la clave, así que un archivo modificado se vuelve a cargar.
+    """
+    return ImageUtils.load_pixmap(path, (width, height))
+
+
+# Pares (stat, skills) aplanados una sola vez, omitiendo stats sin skills (CON).
+# Los nombres de skill se internan: son las claves de proficiency_checkboxes
+_STATS_WITH_SKILLS = tuple(
+    (stat, tuple(intern(skill) for skill in Character.SKILLS[stat]))
+    for stat in Character.STATS if Character.SKILLS[stat]
+)
+
+
+class _ImageCheckSignals(QObject):
+    """Señales del validador de imágenes en segundo plano"""
+    finished = Signal(str, bool)  # Ruta de la imagen, es válida
+
+
+class _ImageCheckTask(QRunnable):
+    """Valida una imagen (apertura + verify de Pillow) fuera del hilo de la UI"""
+    
+    def __init__(self, image_path: str):
+        super().__init__()
+        self.image_path = image_path
+        self.signals = _ImageCheckSignals()
+    
+    def run(self):
+        self.signals.finished.emit(self.image_path, ImageUtils.is_valid_image(self.image_path))
 
 
 class CharacterForm(QDialog):
@@ -24,28 +71,42 @@ class CharacterForm(QDialog):
     # Señal emitida cuando se guarda un personaje
     character_saved = Signal(Character)
     
+    # Placeholder compartido por todos los formularios (QPixmap es copy-on-write)
+    _PLACEHOLDER_PIXMAP: QPixmap = None
+    
     def __init__(self, parent=None, character: Character = None):
         super().__init__(parent)
         self.character = character  # None para nuevo personaje
         self.selected_image_path = None
         self.image_utils = ImageUtils()
+        self._image_check_task = None  # Validación de imagen en curso
+        
+        if CharacterForm._PLACEHOLDER_PIXMAP is None:
+            CharacterForm._PLACEHOLDER_PIXMAP = ImageUtils.create_placeholder_pixmap((120, 120), "Sin Imagen")
         
         self.setWindowTitle("Editar Personaje" if character else "Nuevo Personaje")
         self.setModal(True)
         self.setMinimumSize(600, 800)
         self.resize(650, 850)
         
-        self._setup_ui()
-        
-        # Aplicar tema del formulario
+        # Aplicar tema del formulario antes de construir los hijos: cada widget
+        # se pule una sola vez con la hoja final en lugar de dos
         self.setStyleSheet(get_character_form_style())
         
+        self._setup_ui()
+        
         # Si estamos editando, cargar datos
         if self.character:
             self._load_character_data()
     
     def _setup_ui(self):
         """Configurar la interfaz de usuario"""
+        # Agrupar todas las invalidaciones de layout/estilo en una sola pasada al final
+        self.setUpdatesEnabled(False)
+        
+        # Pares (señal, slot) que se conectan cuando el formulario ya está completo
+        self._pending_connections = []
+        
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -78,6 +139,14 @@ class CharacterForm(QDialog):
         # === BOTONES ===
         buttons_layout = self._create_buttons_layout()
         layout.addLayout(buttons_layout)
+        
+        # Conectar señales solo con todos los widgets construidos: ningún slot
+        # puede dispararse sobre un formulario a medio armar
+        for signal, slot in self._pending_connections:
+            signal.connect(slot)
+        self._pending_connections.clear()
+        
+        self.setUpdatesEnabled(True)
     
     def _create_basic_info_section(self) -> QGroupBox:
         """Crear sección de información básica"""
@@ -119,8 +188,7 @@ class CharacterForm(QDialog):
         self.image_label.setScaledContents(False)
         
         # Mostrar placeholder inicial
-        placeholder = ImageUtils.create_placeholder_pixmap((120, 120), "Sin Imagen")
-        self.image_label.setPixmap(placeholder)
+        self.image_label.setPixmap(CharacterForm._PLACEHOLDER_PIXMAP)
         
         image_layout.addWidget(self.image_label)
         
@@ -128,10 +196,10 @@ class CharacterForm(QDialog):
         image_buttons_layout = QVBoxLayout()
         
         self.select_image_button = QPushButton("Seleccionar Imagen")
-        self.select_image_button.clicked.connect(self._select_image)
+        self._pending_connections.append((self.select_image_button.clicked, self._select_image))
         
         self.remove_image_button = QPushButton("Quitar Imagen")
-        self.remove_image_button.clicked.connect(self._remove_image)
+        self._pending_connections.append((self.remove_image_button.clicked, self._remove_image))
         self.remove_image_button.setEnabled(False)
         
         image_buttons_layout.addWidget(self.select_image_button)
@@ -160,7 +228,11 @@ class CharacterForm(QDialog):
         stats_layout = QGridLayout()
         stats_layout.setSpacing(15)
         
-        self.stat_spinboxes = {}
+        group.setUpdatesEnabled(False)
+        
+        self._stat_spinbox = {}         # stat -> QSpinBox
+        self._stat_modifier_label = {}  # stat -> QLabel del modificador
+        self._spinbox_to_stat = {}  # Mapa inverso para el slot compartido _on_stat_changed
         
         # Crear spinboxes para cada stat
         for i, stat in enumerate(Character.STATS):
@@ -176,7 +248,8 @@ class CharacterForm(QDialog):
             spinbox.setRange(Character.MIN_STAT, Character.MAX_STAT)
             spinbox.setValue(10)  # Valor por defecto
             spinbox.setFixedWidth(80)
-            spinbox.valueChanged.connect(lambda value, s=stat: self._update_modifier_preview(s, value))
+            self._spinbox_to_stat[spinbox] = stat
+            self._pending_connections.append((spinbox.valueChanged, self._on_stat_changed))
             
             # Label para mostrar el modificador
             modifier_label = QLabel("(+0)")
@@ -184,10 +257,8 @@ class CharacterForm(QDialog):
             modifier_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             
             # Guardar referencias
-            self.stat_spinboxes[stat] = {
-                'spinbox': spinbox,
-                'modifier_label': modifier_label
-            }
+            self._stat_spinbox[stat] = spinbox
+            self._stat_modifier_label[stat] = modifier_label
             
             # Añadir al grid
             stats_layout.addWidget(stat_label, row, col)
@@ -195,10 +266,11 @@ class CharacterForm(QDialog):
             stats_layout.addWidget(modifier_label, row, col + 2)
         
         layout.addLayout(stats_layout)
+        group.setUpdatesEnabled(True)
         
         # Botón para generar stats aleatorios
         random_button = QPushButton("Generar Stats Aleatorios")
-        random_button.clicked.connect(self._generate_random_stats)
+        self._pending_connections.append((random_button.clicked, self._generate_random_stats))
         layout.addWidget(random_button)
         
         return group
@@ -215,47 +287,27 @@ class CharacterForm(QDialog):
         description.setWordWrap(True)
         layout.addWidget(description)
         
-        # Scroll area para los checkboxes
-        scroll_area = QScrollArea()
-        scroll_area.setFixedHeight(200)
-        scroll_area.setWidgetResizable(True)
-        
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout(scroll_widget)
+        # Scroll area para los checkboxes (se llena al mostrar el diálogo,
+        # ver _populate_proficiencies)
+        self._proficiency_scroll_area = QScrollArea()
+        self._proficiency_scroll_area.setFixedHeight(200)
+        self._proficiency_scroll_area.setWidgetResizable(True)
+        self._proficiency_scroll_area.setWidget(QLabel("Cargando..."))
         
         self.proficiency_checkboxes = {}
+        self._profs_built = False
         
-        # Crear checkboxes organizados por stat
-        for stat in Character.STATS:
-            skills = Character.SKILLS[stat]
-            if not skills:  # Skip CON ya que no tiene skills
-                continue
-                
-            # Título del stat
-            stat_title = QLabel(f"{stat} Skills:")
-            stat_title.setFont(self._get_bold_font())
-            stat_title.setStyleSheet("color: #FFFFFF; margin-top: 10px;")
-            scroll_layout.addWidget(stat_title)
-            
-            # Checkboxes para las skills de este stat
-            for skill in skills:
-                checkbox = QCheckBox(skill)
-                checkbox.setStyleSheet("margin-left: 20px;")
-                self.proficiency_checkboxes[skill] = checkbox
-                scroll_layout.addWidget(checkbox)
-        
-        scroll_area.setWidget(scroll_widget)
-        layout.addWidget(scroll_area)
+        layout.addWidget(self._proficiency_scroll_area)
         
         # Botones de ayuda
         buttons_layout = QHBoxLayout()
         
         select_all_btn = QPushButton("Seleccionar Todas")
-        select_all_btn.clicked.connect(self._select_all_proficiencies)
+        self._pending_connections.append((select_all_btn.clicked, self._select_all_proficiencies))
         select_all_btn.setFixedWidth(120)
         
         clear_all_btn = QPushButton("Limpiar Todas")
-        clear_all_btn.clicked.connect(self._clear_all_proficiencies)
+        self._pending_connections.append((clear_all_btn.clicked, self._clear_all_proficiencies))
         clear_all_btn.setFixedWidth(120)
         
         buttons_layout.addWidget(select_all_btn)
@@ -266,6 +318,41 @@ class CharacterForm(QDialog):
         
         return group
     
+    def _populate_proficiencies(self):
+        """Construir los checkboxes de competencias (solo la primera vez)"""
+        if self._profs_built:
+            return
+        self._profs_built = True
+        
+        self._proficiency_scroll_area.setUpdatesEnabled(False)
+        
+        scroll_widget = QWidget()
+        scroll_widget.setObjectName("proficiencyList")  # Estilos en get_character_form_style()
+        scroll_layout = QVBoxLayout(scroll_widget)
+        
+        # Crear checkboxes organizados por stat
+        for stat, skills in _STATS_WITH_SKILLS:
+            # Título del stat
+            stat_title = QLabel(f"{stat} Skills:")
+            stat_title.setFont(self._get_bold_font())
+            stat_title.setProperty("role", "statTitle")
+            scroll_layout.addWidget(stat_title)
+            
+            # Checkboxes para las skills de este stat
+            for skill in skills:
+                checkbox = QCheckBox(skill)
+                self.proficiency_checkboxes[skill] = checkbox
+                scroll_layout.addWidget(checkbox)
+        
+        # Reemplaza (y elimina) el label "Cargando..."
+        self._proficiency_scroll_area.setWidget(scroll_widget)
+        self._proficiency_scroll_area.setUpdatesEnabled(True)
+    
+    def showEvent(self, event):
+        """Construir las competencias justo antes de mostrarse por primera vez"""
+        self._populate_proficiencies()
+        super().showEvent(event)
+    
     def _select_all_proficiencies(self):
         """Seleccionar todas las competencias"""
         for checkbox in self.proficiency_checkboxes.values():
@@ -285,13 +372,13 @@ class CharacterForm(QDialog):
         
         # Botón Cancelar
         self.cancel_button = QPushButton("Cancelar")
-        self.cancel_button.clicked.connect(self.reject)
+        self._pending_connections.append((self.cancel_button.clicked, self.reject))
         self.cancel_button.setFixedWidth(120)
         
         # Botón Guardar
         save_text = "Actualizar" if self.character else "Crear"
         self.save_button = QPushButton(save_text)
-        self.save_button.clicked.connect(self._save_character)
+        self._pending_connections.append((self.save_button.clicked, self._save_character))
         self.save_button.setFixedWidth(120)
         self.save_button.setDefault(True)
         
@@ -300,15 +387,19 @@ class CharacterForm(QDialog):
         
         return layout
     
-    def _get_section_font(self) -> QFont:
-        """Obtener fuente para títulos de sección"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_section_font() -> QFont:
+        """Obtener fuente para títulos de sección (se crea una sola vez)"""
         font = QFont()
         font.setPointSize(11)
         font.setBold(True)
         return font
     
-    def _get_bold_font(self) -> QFont:
-        """Obtener fuente en negrita"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_bold_font() -> QFont:
+        """Obtener fuente en negrita (se crea una sola vez)"""
         font = QFont()
         font.setBold(True)
         return font
@@ -319,55 +410,84 @@ class CharacterForm(QDialog):
         file_dialog.setNameFilter("Imágenes (*.png *.jpg *.jpeg *.gif *.bmp)")
         file_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
         file_dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptOpen)
+        file_dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         
-        if file_dialog.exec():
-            selected_files = file_dialog.selectedFiles()
-            if selected_files:
-                image_path = selected_files[0]
-                
-                # Verificar que es una imagen válida
-                if ImageUtils.is_valid_image(image_path):
-                    self.selected_image_path = image_path
-                    self._update_image_preview()
-                    self.remove_image_button.setEnabled(True)
-                else:
-                    QMessageBox.warning(self, "Error", "El archivo seleccionado no es una imagen válida.")
+        # Diálogo no bloqueante: el resultado llega por la señal fileSelected
+        file_dialog.fileSelected.connect(self._on_image_selected)
+        file_dialog.open()
+    
+    def _on_image_selected(self, image_path: str):
+        """Validar en segundo plano la imagen elegida en el diálogo"""
+        if not image_path:
+            return
+        
+        task = _ImageCheckTask(image_path)
+        task.signals.finished.connect(self._on_image_checked)
+        # Mantener la referencia hasta que termine para que Python no la libere
+        self._image_check_task = task
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_image_checked(self, image_path: str, is_valid: bool):
+        """Aplicar el resultado de la validación (se ejecuta en el hilo de la UI)"""
+        # Descartar resultados de una selección anterior (llegaron fuera de orden)
+        if self._image_check_task is not None and self._image_check_task.image_path != image_path:
+            return
+        self._image_check_task = None
+        
+        if is_valid:
+            self.selected_image_path = image_path
+            self._update_image_preview()
+            self.remove_image_button.setEnabled(True)
+        else:
+            QMessageBox.warning(self, "Error", "El archivo seleccionado no es una imagen válida.")
     
     def _remove_image(self):
         """Quitar la imagen seleccionada"""
         self.selected_image_path = None
-        placeholder = ImageUtils.create_placeholder_pixmap((120, 120), "Sin Imagen")
-        self.image_label.setPixmap(placeholder)
+        self.image_label.setPixmap(CharacterForm._PLACEHOLDER_PIXMAP)
         self.remove_image_button.setEnabled(False)
     
-    def _update_image_preview(self):
-        """Actualizar la vista previa de la imagen"""
+    def _update_image_preview(self, mtime_ns: int = None):
+        """
+        Actualizar la vista previa de la imagen
+        
+        Args:
+            mtime_ns: mtime ya conocido de la imagen (evita un os.stat extra)
+        """
         if self.selected_image_path:
-            pixmap = ImageUtils.load_pixmap(self.selected_image_path, (120, 120))
+            if mtime_ns is None:
+                try:
+                    mtime_ns = os.stat(self.selected_image_path).st_mtime_ns
+                except OSError:
+                    return
+            pixmap = _cached_pixmap(self.selected_image_path, mtime_ns, 120, 120)
             if pixmap:
                 self.image_label.setPixmap(pixmap)
     
+    def _on_stat_changed(self, value: int):
+        """Slot compartido por todos los spinboxes de stats"""
+        self._update_modifier_preview(self._spinbox_to_stat[self.sender()], value)
+    
     def _update_modifier_preview(self, stat: str, value: int):
         """Actualizar la vista previa del modificador"""
-        # Calcular modificador usando la fórmula de D&D
-        modifier = (value - 10) // 2
-        modifier_str = f"+{modifier}" if modifier >= 0 else str(modifier)
-        
-        # Actualizar label
-        self.stat_spinboxes[stat]['modifier_label'].setText(f"({modifier_str})")
+        # Modificador D&D precalculado: (valor - 10) // 2
+        self._stat_modifier_label[stat].setText(_MOD_STR_CACHE[value])
     
     def _generate_random_stats(self):
         """Generar estadísticas aleatorias (4d6, drop lowest)"""
-        import random
+        # Todas las tiradas (4 dados por stat) en una sola llamada al RNG
+        dice = random.choices(_D6_FACES, k=4 * len(Character.STATS))
         
-        for stat in Character.STATS:
+        for i, stat in enumerate(Character.STATS):
             # Método clásico: 4d6, descartar el menor
-            rolls = [random.randint(1, 6) for _ in range(4)]
-            rolls.sort()
-            stat_value = sum(rolls[1:])  # Sumar los 3 más altos
+            rolls = dice[4 * i:4 * i + 4]
+            stat_value = sum(rolls) - min(rolls)  # Sumar los 3 más altos
             
-            # Actualizar spinbox
-            self.stat_spinboxes[stat]['spinbox'].setValue(stat_value)
+            # Actualizar spinbox sin emitir valueChanged; el modificador se actualiza directo
+            spinbox = self._stat_spinbox[stat]
+            with QSignalBlocker(spinbox):
+                spinbox.setValue(stat_value)
+            self._update_modifier_preview(stat, stat_value)
     
     def _load_character_data(self):
         """Cargar datos del personaje para edición"""
@@ -381,38 +501,46 @@ class CharacterForm(QDialog):
         if hasattr(self.character, 'character_class'):
             self.class_combo.setCurrentText(self.character.character_class)
         
-        # Cargar imagen
-        if self.character.image_path and os.path.exists(self.character.image_path):
+        # Cargar imagen (un solo stat: comprueba existencia y da el mtime para el cache)
+        try:
+            image_stat = os.stat(self.character.image_path)
+        except (OSError, TypeError):
+            image_stat = None
+        
+        if image_stat is not None:
             self.selected_image_path = self.character.image_path
-            self._update_image_preview()
+            self._update_image_preview(image_stat.st_mtime_ns)
             self.remove_image_button.setEnabled(True)
         
         # Cargar stats
         for stat in Character.STATS:
             value = self.character.get_stat(stat)
-            self.stat_spinboxes[stat]['spinbox'].setValue(value)
+            spinbox = self._stat_spinbox[stat]
+            if spinbox.value() == value:
+                continue  # Spinbox y modificador ya sincronizados (p. ej. el valor por defecto)
+            with QSignalBlocker(spinbox):
+                spinbox.setValue(value)
             self._update_modifier_preview(stat, value)
         
-        # Cargar proficiencies
+        # Cargar proficiencies (los checkboxes deben existir antes de marcarlos)
+        self._populate_proficiencies()
         if hasattr(self.character, 'proficiencies'):
+            # Set construido una vez: pertenencia O(1) en lugar de recorrer la lista por skill
+            proficiency_set = set(self.character.proficiencies)
             for skill, checkbox in self.proficiency_checkboxes.items():
-                checkbox.setChecked(skill in self.character.proficiencies)
+                checkbox.setChecked(skill in proficiency_set)
     
     def _save_character(self):
         """Validar y guardar el personaje"""
         # Obtener datos del formulario
         name = self.name_edit.text().strip()
         character_class = self.class_combo.currentText()
-        stats = {}
-        
-        for stat in Character.STATS:
-            stats[stat] = self.stat_spinboxes[stat]['spinbox'].value()
+        stats = {stat: self._stat_spinbox[stat].value() for stat in Character.STATS}
         
         # Obtener proficiencies seleccionadas
-        proficiencies = []
-        for skill, checkbox in self.proficiency_checkboxes.items():
-            if checkbox.isChecked():
-                proficiencies.append(skill)
+        self._populate_proficiencies()
+        proficiencies = [skill for skill, checkbox in self.proficiency_checkboxes.items()
+                         if checkbox.isChecked()]
         
         # Validar datos
         is_valid, error_message = validate_character_data(name, stats, character_class, proficiencies)
@@ -426,7 +554,7 @@ class CharacterForm(QDialog):
                 # Actualizar personaje existente
                 self.character.name = name
                 self.character.character_class = character_class
-                self.character.proficiencies = proficiencies.copy()
+                self.character.proficiencies = proficiencies
                 
                 for stat, value in stats.items():
                     self.character.set_stat(stat, value)
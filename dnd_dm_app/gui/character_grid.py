@@ -4,13 +4,61 @@ Grid responsivo para mostrar tarjetas de personajes
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, 
                               QFrame, QLabel, QPushButton, QMessageBox, QSizePolicy)
-from PySide6.QtCore import Qt, Signal, QSize, QTimer
+from PySide6.QtCore import Qt, Signal, QSize, QTimer, QEvent
 from PySide6.QtGui import QFont, QResizeEvent
 
 from typing import List, Dict
 from models.character import Character
-from gui.character_card import CharacterCard
-from utils.theme import get_character_grid_style
+from gui.character_card import CharacterCard, CardActionRouter
+from utils import layout_math
+from utils.theme import get_character_grid_style, get_character_card_style
+
+
+# Hoja de estilos del grid (se genera una sola vez y la comparten todos los grids)
+_GRID_STYLE = None
+
+
+def _grid_style() -> str:
+    """Obtener la hoja de estilos del grid, generándola solo la primera vez"""
+    global _GRID_STYLE
+    if _GRID_STYLE is None:
+        _GRID_STYLE = get_character_grid_style()
+    return _GRID_STYLE
+
+
+# Fuentes compartidas del estado vacío (se crean al construir el primer grid)
+_ICON_FONT = None
+_TITLE_FONT = None
+_DESC_FONT = None
+
+
+def _make_font(point_size: int, bold: bool = False) -> QFont:
+    """Crear una fuente con tamaño y peso dados"""
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setBold(bold)
+    return font
+
+
+def _init_fonts():
+    """Inicializar las fuentes compartidas una sola vez"""
+    global _ICON_FONT, _TITLE_FONT, _DESC_FONT
+    if _ICON_FONT is not None:
+        return
+    
+    _ICON_FONT = _make_font(48, bold=True)
+    _TITLE_FONT = _make_font(18, bold=True)
+    _DESC_FONT = _make_font(12)
+
+
+class _Row:
+    """Fila del FlowLayout: frame contenedor, su layout y las tarjetas que contiene"""
+    __slots__ = ('frame', 'layout', 'cards')
+    
+    def __init__(self, frame: QFrame, layout: QHBoxLayout):
+        self.frame = frame
+        self.layout = layout
+        self.cards: List[CharacterCard] = []
 
 
 class FlowLayout(QVBoxLayout):
@@ -25,71 +73,125 @@ class FlowLayout(QVBoxLayout):
         self.setContentsMargins(20, 20, 20, 20)
         self.character_grid = character_grid
         
-        # Lista para mantener las filas actuales
-        self.rows = []
+        # Lista para mantener las filas actuales (cada una guarda sus tarjetas,
+        # así no hay que recorrer los layouts de Qt)
+        self.rows: List[_Row] = []
+        # Índice de fila de cada tarjeta
+        self.card_to_row: Dict[CharacterCard, int] = {}
+        # Filas vacías (ocultas) disponibles para reutilizar en vez de crear nuevas
+        self._row_pool: List[_Row] = []
         self.cards_per_row = 4  # Número inicial de tarjetas por fila
-        # Lista para mantener todas las tarjetas
-        self.all_cards = []
+        # Todas las tarjetas por ID de personaje, en orden de inserción
+        # (única fuente de verdad: CharacterGrid busca aquí sus tarjetas)
+        self.by_id: Dict[str, CharacterCard] = {}
+        # Firma del último updateLayout (buckets de tamaño, nº de tarjetas, tarjetas por fila)
+        self._layout_signature = None
+        # (ancho, nº de filas, alto de fila) de la última pasada de _update_card_sizes_only
+        self._last_sizes_args = None
         
     def addCard(self, card: CharacterCard):
         """Agregar una tarjeta al layout"""
-        # Agregar a la lista de todas las tarjetas
-        if card not in self.all_cards:
-            self.all_cards.append(card)
+        self._layout_signature = None
+        self._last_sizes_args = None
+        self._place_card(card)
+    
+    def add_cards_batch(self, cards: List[CharacterCard]):
+        """
+        Agregar varias tarjetas de una vez
+        
+        El contenedor se congela durante la inserción, así que el layout se
+        recalcula una sola vez al final en lugar de una por tarjeta.
+        """
+        if not cards:
+            return
+        self._layout_signature = None
+        self._last_sizes_args = None
+        
+        container = self.parentWidget()
+        if container is not None:
+            container.setUpdatesEnabled(False)
+        try:
+            for card in cards:
+                self._place_card(card)
+        finally:
+            if container is not None:
+                container.setUpdatesEnabled(True)
+                container.updateGeometry()
+    
+    def _place_card(self, card: CharacterCard):
+        """Colocar una tarjeta al final de la última fila (creando fila si está llena)"""
+        # Registrar la tarjeta por ID
+        self.by_id[card.character.id] = card
         
         # Si no hay filas o la fila actual está llena, crear nueva fila
-        if not self.rows or self._get_row_count(self.rows[-1]) >= self.cards_per_row:
+        if not self.rows or len(self.rows[-1].cards) >= self.cards_per_row:
             self._create_new_row()
         
         # Agregar a la última fila
-        current_row = self.rows[-1]
-        current_row['layout'].addWidget(card)
-    
-    def _get_row_count(self, row):
-        """Obtener el número de widgets en una fila (excluyendo spacers)"""
-        count = 0
-        layout = row['layout']
-        for i in range(layout.count()):
-            item = layout.itemAt(i)
-            if item.widget() is not None:
-                count += 1
-        return count
+        row = self.rows[-1]
+        row.layout.addWidget(card)
+        row.cards.append(card)
+        self.card_to_row[card] = len(self.rows) - 1
     
     def removeCard(self, card: CharacterCard):
         """Remover una tarjeta del layout"""
-        # Remover de la lista de todas las tarjetas
-        if card in self.all_cards:
-            self.all_cards.remove(card)
+        # Quitar del índice por ID (solo si esta es la tarjeta registrada)
+        if self.by_id.get(card.character.id) is card:
+            del self.by_id[card.character.id]
+        self._layout_signature = None
+        self._last_sizes_args = None
+        
+        # Fila de la tarjeta por índice, sin recorrer los layouts
+        row_idx = self.card_to_row.pop(card, None)
+        if row_idx is None:
+            return
         
-        # Buscar y remover del layout
-        for row in self.rows:
-            layout = row['layout']
-            for i in range(layout.count()):
-                item = layout.itemAt(i)
-                if item.widget() == card:
-                    layout.removeWidget(card)
-                    card.deleteLater()
-                    
-                    # Si la fila quedó vacía, removerla
-                    if self._get_row_count(row) == 0:
-                        self.removeWidget(row['frame'])
-                        row['frame'].deleteLater()
-                        self.rows.remove(row)
-                    return
+        row = self.rows[row_idx]
+        row.cards.remove(card)
+        row.layout.removeWidget(card)
+        card.deleteLater()
+        
+        # Si la fila quedó vacía, removerla y desplazar el índice de las filas siguientes
+        if not row.cards:
+            self._release_row(row)
+            del self.rows[row_idx]
+            for later_idx in range(row_idx, len(self.rows)):
+                for later_card in self.rows[later_idx].cards:
+                    self.card_to_row[later_card] = later_idx
     
     def clear(self):
         """Limpiar todo el layout"""
-        # Limpiar lista de tarjetas
-        self.all_cards.clear()
-        
-        # Remover todas las filas
-        for row in self.rows:
-            self.removeWidget(row['frame'])
-            row['frame'].deleteLater()
+        # Limpiar índice de tarjetas
+        self.by_id.clear()
+        self.card_to_row.clear()
+        self._layout_signature = None
+        self._last_sizes_args = None
+        
+        # Remover todas las filas (también las del pool)
+        for row in self.rows + self._row_pool:
+            self.removeWidget(row.frame)
+            row.frame.deleteLater()
         self.rows.clear()
+        self._row_pool.clear()
+    
+    def _release_row(self, row: _Row):
+        """Sacar una fila vacía del layout y guardarla en el pool para reutilizarla"""
+        row.cards.clear()
+        self.removeWidget(row.frame)
+        row.frame.hide()
+        self._row_pool.append(row)
     
     def _create_new_row(self, row_height: int = None):
         """Crear una nueva fila horizontal con altura flexible"""
+        # Reutilizar una fila del pool si hay alguna
+        if self._row_pool:
+            row = self._row_pool.pop()
+            row.frame.setMinimumHeight(row_height or 300)
+            self.addWidget(row.frame)
+            row.frame.show()
+            self.rows.append(row)
+            return
+        
         # Crear frame contenedor para la fila
         row_frame = QFrame()
         
@@ -105,45 +207,37 @@ class FlowLayout(QVBoxLayout):
         row_layout.setSpacing(15)
         row_layout.setContentsMargins(0, 5, 0, 5)  # Pequeños márgenes verticales
         
-        # Centrar horizontalmente las tarjetas en la fila
+        # Centrar horizontalmente las tarjetas en la fila (por alineación, sin
+        # stretch ni spacers: row_layout.count() == len(row.cards) siempre)
         row_layout.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignTop)
         
         # Agregar la fila al layout principal
         self.addWidget(row_frame)
         
         # Guardar referencia
-        self.rows.append({
-            'frame': row_frame,
-            'layout': row_layout
-        })
+        self.rows.append(_Row(row_frame, row_layout))
     
     def updateLayout(self, available_width: int, available_height: int = None):
         """Actualizar el layout basado en el espacio disponible - comportamiento flexbox completo"""
-        if available_width <= 0 or not self.all_cards:
+        if available_width <= 0 or not self.by_id:
+            return
+        
+        # Nada relevante cambió desde la última pasada (buckets de 32px): no recalcular
+        height_bucket = available_height >> 5 if available_height else 0
+        signature = (available_width >> 5, height_bucket, len(self.by_id), self.cards_per_row)
+        if signature == self._layout_signature:
             return
             
         # Calcular número óptimo de tarjetas por fila con comportamiento flexbox
-        min_card_width = 200  # Ancho mínimo de cada tarjeta
-        max_card_width = 400  # Ancho máximo de cada tarjeta
-        margin = 40  # Márgenes laterales
-        spacing = 15  # Espacio entre tarjetas
-        
-        effective_width = available_width - margin
-        
-        # Calcular cuántas tarjetas caben con el ancho mínimo
-        max_possible_cards = (effective_width + spacing) // (min_card_width + spacing)
-        max_possible_cards = min(max_possible_cards, len(self.all_cards))
-        
-        # Calcular cuántas tarjetas caben con el ancho máximo
-        min_possible_cards = max(1, (effective_width + spacing) // (max_card_width + spacing))
-        
-        # Determinar el número óptimo de tarjetas por fila
-        new_cards_per_row = max(min_possible_cards, min(max_possible_cards, 5))
+        new_cards_per_row = layout_math.cards_per_row(available_width, len(self.by_id))
         
         # Guardar dimensiones disponibles para uso futuro
         self._last_available_width = available_width
         self._last_available_height = available_height
         
+        self._layout_signature = (available_width >> 5, height_bucket,
+                                  len(self.by_id), new_cards_per_row)
+        
         # Si cambió el número de tarjetas por fila, reorganizar
         if new_cards_per_row != self.cards_per_row:
             self.cards_per_row = new_cards_per_row
@@ -161,8 +255,7 @@ class FlowLayout(QVBoxLayout):
         if not width or width < 100:
             # Fallback si no tenemos las dimensiones disponibles
             if self.character_grid and hasattr(self.character_grid, 'scroll_area'):
-                width = self.character_grid.scroll_area.viewport().width()
-                height = self.character_grid.scroll_area.viewport().height()
+                width, height = self.character_grid._cached_viewport_size()
             else:
                 width = 800
                 height = None
@@ -171,65 +264,73 @@ class FlowLayout(QVBoxLayout):
     
     def _reorganize_cards_flexbox(self, available_width: int, available_height: int = None):
         """Reorganizar las tarjetas con comportamiento flexbox completo"""
-        if not self.all_cards:
+        if not self.by_id:
             return
         
-        # Recopilar todas las tarjetas y removerlas de los layouts actuales
-        cards_to_reorganize = self.all_cards.copy()
-        
-        # Limpiar todas las filas pero mantener las tarjetas
-        for row in self.rows:
-            layout = row['layout']
-            # Remover todos los widgets del layout sin eliminarlos
-            while layout.count() > 0:
-                item = layout.takeAt(0)
-                # No llamar deleteLater() aquí, solo remover del layout
+        # Congelar pintado/layout del contenedor durante toda la reorganización
+        container = self.parentWidget()
+        if container is not None:
+            container.setUpdatesEnabled(False)
+        try:
+            self._reorganize_rows(available_width, available_height)
+        finally:
+            if container is not None:
+                container.setUpdatesEnabled(True)
+                container.updateGeometry()
+    
+    def _reorganize_rows(self, available_width: int, available_height: int = None):
+        """Redistribuir las tarjetas reutilizando las filas existentes"""
+        self._last_sizes_args = None
         
-        # Limpiar filas
-        for row in self.rows:
-            self.removeWidget(row['frame'])
-            row['frame'].deleteLater()
-        self.rows.clear()
+        # Recopilar todas las tarjetas y removerlas de los layouts actuales
+        cards_to_reorganize = list(self.by_id.values())
         
         # Calcular distribución flexbox
         total_cards = len(cards_to_reorganize)
         cards_per_row = self.cards_per_row
+        total_rows = (total_cards + cards_per_row - 1) // cards_per_row
+        
+        # Una sola pasada: vaciar cada fila (manteniendo las tarjetas) y devolver
+        # al pool solo las que sobran; el resto se reutiliza
+        for row_idx, row in enumerate(self.rows):
+            layout = row.layout
+            # Remover todos los widgets del layout sin eliminarlos: desde el final
+            # (sin desplazar el array interno) y con el conteo ya conocido en row.cards
+            for item_idx in range(len(row.cards) - 1, -1, -1):
+                layout.takeAt(item_idx)
+            row.cards.clear()
+            if row_idx >= total_rows:
+                self._release_row(row)
+        del self.rows[total_rows:]
+        self.card_to_row.clear()
         
         # Calcular altura por fila - MAXIMIZAR uso del espacio vertical
-        row_height = None
-        if available_height and total_cards > 0:
-            total_rows = (total_cards + cards_per_row - 1) // cards_per_row
-            # Usar casi todo el espacio disponible (solo 30px de margen total)
-            row_height = (available_height - 30) // total_rows
-            # Altura mínima más generosa, sin límite máximo estricto
-            row_height = max(300, row_height)  # Permitir que crezca tanto como sea necesario
+        row_height = layout_math.row_height(available_height, total_rows)
         
         # Reorganizar en filas
-        for i in range(0, total_cards, cards_per_row):
-            # Crear nueva fila con altura calculada
-            self._create_new_row(row_height)
-            current_row = self.rows[-1]
+        for row_idx, i in enumerate(range(0, total_cards, cards_per_row)):
+            if row_idx < len(self.rows):
+                # Reutilizar fila existente con la nueva altura
+                current_row = self.rows[row_idx]
+                current_row.frame.setMinimumHeight(row_height or 300)
+            else:
+                # Crear nueva fila con altura calculada
+                self._create_new_row(row_height)
+                current_row = self.rows[row_idx]
             
             # Obtener tarjetas para esta fila
             cards_in_this_row = cards_to_reorganize[i:i + cards_per_row]
             
             # Actualizar tamaño de cada tarjeta para comportamiento flexbox
             for card in cards_in_this_row:
-                # Reconectar señales
-                if self.character_grid:
-                    try:
-                        card.edit_requested.disconnect()
-                        card.delete_requested.disconnect()
-                    except:
-                        pass
-                    card.edit_requested.connect(self.character_grid.edit_character_requested)
-                    card.delete_requested.connect(self.character_grid.delete_character_requested)
-                
                 # Actualizar tamaño flexbox con altura disponible
                 card.update_card_size(available_width, len(cards_in_this_row), row_height)
                 
-                # Agregar a la fila
-                current_row['layout'].addWidget(card)
+                # Agregar a la fila (las conexiones de sus botones sobreviven al
+                # cambio de fila: no hay que reconectar nada aquí)
+                current_row.layout.addWidget(card)
+                self.card_to_row[card] = row_idx
+            current_row.cards.extend(cards_in_this_row)
     
     def _update_card_sizes_only(self, available_width: int, available_height: int = None):
         """Actualizar solo los tamaños de las tarjetas sin reorganizar - flexbox completo"""
@@ -237,27 +338,23 @@ class FlowLayout(QVBoxLayout):
             return
         
         # Calcular altura por fila - maximizar espacio vertical
-        row_height = None
-        if available_height and len(self.rows) > 0:
-            row_height = (available_height - 30) // len(self.rows)
-            row_height = max(300, row_height)  # Sin límite máximo estricto
+        row_height = layout_math.row_height(available_height, len(self.rows))
+        
+        # Mismas filas y alto, y ancho a menos de 8px del anterior: las tarjetas no cambian
+        last = self._last_sizes_args
+        if (last is not None and last[1:] == (len(self.rows), row_height)
+                and abs(available_width - last[0]) < 8):
+            return
+        self._last_sizes_args = (available_width, len(self.rows), row_height)
             
         for row in self.rows:
-            layout = row['layout']
-            cards_in_row = []
-            
-            # Recopilar tarjetas en esta fila
-            for i in range(layout.count()):
-                item = layout.itemAt(i)
-                if item.widget() and hasattr(item.widget(), 'update_card_size'):
-                    cards_in_row.append(item.widget())
-            
             # Actualizar altura del frame de la fila para maximizar espacio
             if row_height:
-                row['frame'].setMinimumHeight(row_height)
+                row.frame.setMinimumHeight(row_height)
                 # Sin altura máxima - permitir que use todo el espacio necesario
             
             # Actualizar tamaño de cada tarjeta en la fila
+            cards_in_row = row.cards
             for card in cards_in_row:
                 card.update_card_size(available_width, len(cards_in_row), row_height)
 
@@ -274,19 +371,37 @@ class CharacterGrid(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        # Diccionario para mapear IDs a tarjetas
-        self.character_cards: Dict[str, CharacterCard] = {}
+        # True durante cargas masivas: _update_visibility se aplaza hasta el final
+        self._bulk = False
+        # Layout pendiente para el próximo showEvent (el viewport aún no tenía tamaño)
+        self._layout_pending = False
+        
+        # Tamaño del viewport cacheado en resizeEvent/eventFilter (None = leer de Qt)
+        self._viewport_w = None
+        self._viewport_h = None
         
         self._setup_ui()
         
+        # Enrutador de acciones propio: lo comparten solo las tarjetas de este grid
+        self.action_router = CardActionRouter(self)
+        self.action_router.edit_requested.connect(self.edit_character_requested)
+        self.action_router.delete_requested.connect(self.delete_character_requested)
+        
         # Aplicar tema con fondo morado oscuro
-        self.setStyleSheet(get_character_grid_style())
+        self.setStyleSheet(_grid_style())
+        
+        # Último bucket de tamaño procesado en resizeEvent
+        self._last_bucket = (0, 0)
         
         # Timer para evitar reorganizar demasiado frecuentemente
         self.resize_timer = QTimer()
         self.resize_timer.setSingleShot(True)
         self.resize_timer.timeout.connect(self._on_resize_timeout)
         
+        # El viewport cambia de ancho sin que el grid se redimensione cuando aparece
+        # o desaparece la barra vertical: seguir sus propios resizes
+        self.scroll_area.viewport().installEventFilter(self)
+        
     def _setup_ui(self):
         """Configurar la interfaz de usuario"""
         layout = QVBoxLayout(self)
@@ -304,6 +419,9 @@ class CharacterGrid(QWidget):
         self.flow_layout = FlowLayout(self.scroll_widget, self)
         self.scroll_widget.setLayout(self.flow_layout)
         
+        # Tema de tarjetas: una sola hoja de estilos para todas las tarjetas
+        self.scroll_widget.setStyleSheet(get_character_card_style())
+        
         # Configurar el scroll area
         self.scroll_area.setWidget(self.scroll_widget)
         layout.addWidget(self.scroll_area)
@@ -324,27 +442,21 @@ class CharacterGrid(QWidget):
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.setSpacing(20)
         
+        _init_fonts()
+        
         # Icono grande
         icon_label = QLabel("D&D")
-        icon_font = QFont()
-        icon_font.setPointSize(48)
-        icon_font.setBold(True)
-        icon_label.setFont(icon_font)
+        icon_label.setFont(_ICON_FONT)
         icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Texto principal
         title_label = QLabel("No hay personajes")
-        title_font = QFont()
-        title_font.setPointSize(18)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(_TITLE_FONT)
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Texto descriptivo
         desc_label = QLabel("¡Crea tu primer personaje para empezar la aventura!")
-        desc_font = QFont()
-        desc_font.setPointSize(12)
-        desc_label.setFont(desc_font)
+        desc_label.setFont(_DESC_FONT)
         desc_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         desc_label.setWordWrap(True)
         
@@ -361,24 +473,17 @@ class CharacterGrid(QWidget):
         Args:
             character: Personaje a agregar
         """
-        if character.id in self.character_cards:
+        if character.id in self.flow_layout.by_id:
             # Si ya existe, actualizar
             self.update_character(character)
             return
         
-        # Crear nueva tarjeta
-        card = CharacterCard(character)
-        
-        # Conectar señales
-        card.edit_requested.connect(self.edit_character_requested)
-        card.delete_requested.connect(self.delete_character_requested)
+        # Crear nueva tarjeta (sus botones se enrutan por el CardActionRouter del grid)
+        card = CharacterCard(character, self.action_router)
         
-        # Agregar al layout
+        # Agregar al layout (que la registra por ID)
         self.flow_layout.addCard(card)
         
-        # Guardar referencia
-        self.character_cards[character.id] = card
-        
         # Actualizar visibilidad
         self._update_visibility()
     
@@ -389,10 +494,9 @@ class CharacterGrid(QWidget):
         Args:
             character_id: ID del personaje a remover
         """
-        if character_id in self.character_cards:
-            card = self.character_cards[character_id]
+        card = self.flow_layout.by_id.get(character_id)
+        if card is not None:
             self.flow_layout.removeCard(card)
-            del self.character_cards[character_id]
             
             # Actualizar visibilidad
             self._update_visibility()
@@ -404,14 +508,13 @@ class CharacterGrid(QWidget):
         Args:
             character: Personaje con información actualizada
         """
-        if character.id in self.character_cards:
-            card = self.character_cards[character.id]
+        card = self.flow_layout.by_id.get(character.id)
+        if card is not None:
             card.update_character(character)
     
     def clear_all(self):
         """Remover todos los personajes del grid"""
         self.flow_layout.clear()
-        self.character_cards.clear()
         self._update_visibility()
     
     def set_characters(self, characters: List[Character]):
@@ -421,31 +524,84 @@ class CharacterGrid(QWidget):
         Args:
             characters: Lista de personajes a mostrar
         """
-        # Limpiar grid actual
-        self.clear_all()
+        # Carga masiva: sin repintados ni cambios de visibilidad por personaje
+        self._bulk = True
+        self.setUpdatesEnabled(False)
+        try:
+            # Limpiar grid actual
+            self.clear_all()
+            
+            # Crear todas las tarjetas y agregarlas al layout en un solo lote
+            new_cards: Dict[str, CharacterCard] = {}
+            for character in characters:
+                card = new_cards.get(character.id)
+                if card is not None:
+                    # ID repetido: actualizar la tarjeta ya creada
+                    card.update_character(character)
+                    continue
+                new_cards[character.id] = CharacterCard(character, self.action_router)
+            self.flow_layout.add_cards_batch(list(new_cards.values()))
+        finally:
+            self._bulk = False
+            self.setUpdatesEnabled(True)
+        
+        # Un solo cambio de visibilidad al terminar
+        self._update_visibility()
         
-        # Agregar todos los personajes
-        for character in characters:
-            self.add_character(character)
+        # Layout sincrónico: aplicar ya la geometría del grid para que el viewport
+        # tenga su tamaño real; si el grid aún no se mostró, esperar a showEvent
+        self.layout().activate()
+        self._invalidate_viewport_size()
+        if not self._force_layout_update():
+            self._layout_pending = True
+    
+    def _cached_viewport_size(self):
+        """
+        Obtener (ancho, alto) del viewport del scroll area
         
-        # Forzar un update del layout después de cargar todos los personajes
-        QTimer.singleShot(100, self._force_layout_update)
+        Usa el valor cacheado en resizeEvent y solo consulta a Qt si no hay cache.
+        """
+        if self._viewport_w is None:
+            viewport = self.scroll_area.viewport()
+            self._viewport_w = viewport.width()
+            self._viewport_h = viewport.height()
+        return self._viewport_w, self._viewport_h
     
-    def _force_layout_update(self):
-        """Forzar una actualización del layout con flexibilidad completa"""
+    def _invalidate_viewport_size(self):
+        """Descartar el tamaño cacheado del viewport"""
+        self._viewport_w = None
+        self._viewport_h = None
+    
+    def _force_layout_update(self) -> bool:
+        """
+        Forzar una actualización del layout con flexibilidad completa
+        
+        Returns:
+            True si el viewport tenía un tamaño válido y se aplicó el layout
+        """
+        if not self.flow_layout.by_id:
+            return False
         if self.scroll_area.isVisible():
-            viewport_width = self.scroll_area.viewport().width()
-            viewport_height = self.scroll_area.viewport().height()
+            viewport_width, viewport_height = self._cached_viewport_size()
             if viewport_width > 100 and viewport_height > 100:
                 self.flow_layout.updateLayout(viewport_width, viewport_height)
+                return True
+        return False
     
     def get_character_count(self) -> int:
         """Obtener el número de personajes en el grid"""
-        return len(self.character_cards)
+        return len(self.flow_layout.by_id)
     
     def _update_visibility(self):
         """Actualizar qué se muestra: grid o estado vacío"""
-        has_characters = len(self.character_cards) > 0
+        if self._bulk:
+            return
+        
+        has_characters = len(self.flow_layout.by_id) > 0
+        
+        # Al mostrarse/ocultarse el scroll area su viewport cambia de tamaño
+        if has_characters != self.scroll_area.isVisibleTo(self):
+            self._invalidate_viewport_size()
         
         self.scroll_area.setVisible(has_characters)
         self.empty_state.setVisible(not has_characters)
@@ -457,28 +613,61 @@ class CharacterGrid(QWidget):
         """Manejar eventos de redimensionamiento"""
         super().resizeEvent(event)
         
-        # Solo procesar si el resize es significativo
-        if hasattr(self, '_last_width'):
-            width_diff = abs(event.size().width() - self._last_width)
-            if width_diff < 50:  # Ignorar cambios menores a 50px
-                return
+        # El layout ya redimensionó el scroll area: cachear el viewport una vez
+        viewport = self.scroll_area.viewport()
+        self._viewport_w = viewport.width()
+        self._viewport_h = viewport.height()
         
-        self._last_width = event.size().width()
+        # Grid vacío: no hay nada que reorganizar
+        if not self.flow_layout.by_id:
+            return
+        
+        # Solo procesar si el resize cambia de bucket (32px en ancho o alto)
+        size = event.size()
+        bucket = (size.width() // 32, size.height() // 32)
+        if bucket == self._last_bucket:
+            return
+        self._last_bucket = bucket
         
         # Usar timer para evitar reorganizar demasiado frecuentemente
-        self.resize_timer.start(200)  # 200ms delay para mayor estabilidad
+        # (start() reinicia el timer: una ráfaga de resizes se coalesce en una sola pasada)
+        self.resize_timer.start(150)
+    
+    def eventFilter(self, watched, event) -> bool:
+        """Mantener el tamaño cacheado del viewport al día con sus propios resizes"""
+        if event.type() == QEvent.Type.Resize and watched is self.scroll_area.viewport():
+            size = event.size()
+            if (size.width(), size.height()) != (self._viewport_w, self._viewport_h):
+                self._viewport_w = size.width()
+                self._viewport_h = size.height()
+                # P. ej. apareció la barra de scroll: reorganizar con el nuevo ancho
+                if self.flow_layout.by_id:
+                    self.resize_timer.start(150)
+        return super().eventFilter(watched, event)
     
     def _on_resize_timeout(self):
         """Manejar timeout del resize - con altura flexible"""
-        if self.scroll_area.isVisible() and hasattr(self, '_last_width'):
+        # Salida temprana para grid vacío u oculto, antes de tocar el viewport
+        if not self.flow_layout.by_id or not self.scroll_area.isVisible():
+            return
+        if self._last_bucket != (0, 0):
             # Usar las dimensiones del viewport del scroll area
-            viewport_width = self.scroll_area.viewport().width()
-            viewport_height = self.scroll_area.viewport().height()
+            viewport_width, viewport_height = self._cached_viewport_size()
             
             # Solo actualizar si tenemos dimensiones válidas
             if viewport_width > 100 and viewport_height > 100:
                 self.flow_layout.updateLayout(viewport_width, viewport_height)
     
+    def showEvent(self, event):
+        """Invalidar el tamaño cacheado del viewport y aplicar un layout pendiente"""
+        self._invalidate_viewport_size()
+        super().showEvent(event)
+        
+        if self._layout_pending:
+            self._layout_pending = False
+            self.layout().activate()
+            self._force_layout_update()
+    
     def sizeHint(self) -> QSize:
         """Sugerir tamaño óptimo para el grid"""
         return QSize(800, 600)
\ No newline at end of file
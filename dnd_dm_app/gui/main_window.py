@@ -5,8 +5,10 @@ Ventana principal de la aplicación RollForge
 from PySide6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
                               QPushButton, QLabel, QMenuBar, QMenu, QMessageBox,
                               QFileDialog, QStatusBar, QToolBar, QSizePolicy)
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QAction, QFont, QIcon, QKeySequence, QPainter, QColor, QPalette, QBrush, QPixmap
+from PySide6.QtCore import (Qt, QTimer, QObject, QRunnable, QThreadPool, Signal,
+                            QMutex, QMutexLocker, QSignalBlocker)
+from PySide6.QtGui import (QAction, QFont, QIcon, QKeySequence, QPainter, QColor,
+                           QPixmap, QPixmapCache)
 
 from gui.character_grid import CharacterGrid
 from gui.character_form import CharacterForm
@@ -15,13 +17,47 @@ from utils.data_manager import DataManager
 from utils.image_utils import get_default_character_icon
 from utils.theme import get_main_window_style
 
+import functools
 import os
 import sys
 import tempfile
+from typing import Optional
+
+
+# Rutas de assets (carpeta assets/ en la raíz del proyecto), calculadas una sola vez
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "assets")
+_DRAGON_PATH = os.path.join(ASSETS_DIR, "dragon.png")
+_CAMPFIRE_PATH = os.path.join(ASSETS_DIR, "campfire.png")
+
+
+@functools.lru_cache(maxsize=None)
+def _asset_exists(path: str) -> bool:
+    """Comprobar (una sola vez por ruta) si existe un asset empaquetado"""
+    return os.path.exists(path)
+
+
+# Hoja de estilos de la ventana principal (se genera una sola vez)
+_MAIN_STYLE = None
+
+
+def _main_style() -> str:
+    """Obtener la hoja de estilos principal, generándola solo la primera vez"""
+    global _MAIN_STYLE
+    if _MAIN_STYLE is None:
+        _MAIN_STYLE = get_main_window_style()
+    return _MAIN_STYLE
+
+
+# Límite mínimo del QPixmapCache (KB) para que quepan varios fondos escalados;
+# solo se amplía, nunca se reduce el límite que fijen otros módulos
+_MIN_PIXMAP_CACHE_KB = 32 * 1024
 
 
 class TransparentWidget(QWidget):
     """Widget con fondo semi-transparente usando StyleSheet inline con !important"""
+    # Hojas de estilo ya formateadas por color (r, g, b, alpha)
+    _style_cache = {}
+    
     def __init__(self, r=0, g=0, b=0, alpha=153, parent=None):
         super().__init__(parent)
         self.r, self.g, self.b, self.alpha = r, g, b, alpha
@@ -29,12 +65,79 @@ class TransparentWidget(QWidget):
         
     def apply_transparent_style(self):
         """Aplicar estilo después de que se haya aplicado el tema global"""
-        self.setStyleSheet(f"""
+        key = (self.r, self.g, self.b, self.alpha)
+        style = TransparentWidget._style_cache.get(key)
+        if style is None:
+            style = f"""
             QWidget#gridContainer {{
                 background-color: rgba({self.r}, {self.g}, {self.b}, {self.alpha});
                 border-radius: 8px;
             }}
-        """)
+        """
+            TransparentWidget._style_cache[key] = style
+        self.setStyleSheet(style)
+
+
+class BackgroundWidget(QWidget):
+    """Widget central que pinta la imagen de fondo directamente en paintEvent"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._bg = QPixmap()
+    
+    def set_background(self, pixmap: QPixmap):
+        """Cambiar el pixmap de fondo (solo programa un repintado, sin tocar la paleta)"""
+        self._bg = pixmap
+        self.update()
+    
+    def paintEvent(self, event):
+        """Dibujar el fondo anclado arriba a la izquierda (como lo hacía el brush de la paleta)"""
+        if self._bg.isNull():
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._bg)
+        painter.end()
+
+
+class WorkerSignals(QObject):
+    """Señales de SaveWorker (un QRunnable no puede emitir señales por sí mismo)"""
+    done = Signal(Character, object, bool)  # personaje, nueva ruta de imagen o None, ok
+
+
+class SaveWorker(QRunnable):
+    """
+    Guarda un personaje (imagen + JSON) fuera del hilo de la GUI
+    
+    El Character lo comparten la GUI y el DataManager: el worker solo trabaja con
+    una instantánea tomada en el hilo principal y nunca lo modifica. La nueva ruta
+    de la imagen vuelve mediante signals.done y se asigna en el hilo principal.
+    """
+    def __init__(self, data_manager: DataManager, character: Character, mutex: QMutex):
+        super().__init__()
+        self.data_manager = data_manager
+        self.character = character
+        self.data = character.to_dict()
+        self.mutex = mutex
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        data = self.data
+        new_image_path = None
+        ok = False
+        try:
+            # DataManager no es thread-safe: serializar todos sus accesos
+            with QMutexLocker(self.mutex):
+                # Guardar imagen si es necesaria
+                image_path = data['image_path']
+                if image_path and not image_path.startswith(str(self.data_manager.images_dir)):
+                    new_image_path = self.data_manager.save_character_image(image_path, data['id'])
+                    if new_image_path:
+                        data['image_path'] = new_image_path
+                
+                # Copia propia del personaje (ya con la ruta definitiva de la imagen)
+                ok = self.data_manager.save_character(Character._unsafe_from_dict(data))
+        except Exception as e:
+            self.data_manager.logger.error(f"Error guardando personaje {data['name']}: {e}")
+        self.signals.done.emit(self.character, new_image_path, ok)
 
 
 class MainWindow(QMainWindow):
@@ -48,11 +151,24 @@ class MainWindow(QMainWindow):
         
         # Variables de estado
         self.characters = []
+        # Índices por ID sobre self.characters (personaje y posición en la lista)
+        self._char_by_id = {}
+        self._char_index = {}
         self.current_character_form = None
         
+        # Protege el DataManager frente a los guardados en segundo plano (SaveWorker)
+        self._data_mutex = QMutex()
+        # Guardados en curso (señales -> worker): mantener las referencias hasta que terminen
+        self._save_workers = {}
+        
         # Cache para la imagen de fondo
         self._background_pixmap = None
         
+        # Timer que agrupa las ráfagas de resize en un solo reescalado suave del fondo
+        self._bg_resize_timer = QTimer(self)
+        self._bg_resize_timer.setSingleShot(True)
+        self._bg_resize_timer.timeout.connect(self._apply_background_rescale)
+        
         # Inicializar gestor de datos con manejo de errores
         try:
             self.data_manager = DataManager()
@@ -80,41 +196,28 @@ class MainWindow(QMainWindow):
                 sys.exit(1)
         
         self._setup_ui()
-        self._create_menus()
-        self._create_status_bar()
         self._connect_signals()
         
         # Aplicar tema oscuro plano PRIMERO
-        self.setStyleSheet(get_main_window_style())
+        self.setStyleSheet(_main_style())
         
         # DESPUÉS aplicar estilos de transparencia que necesitan sobrescribir el tema
         if hasattr(self, 'grid_container'):
             self.grid_container.apply_transparent_style()
         
-        # Cargar personajes guardados
-        self._load_characters()
-        
-        # Timer para guardar automáticamente
-        self.auto_save_timer = QTimer()
-        self.auto_save_timer.timeout.connect(self._auto_save)
-        self.auto_save_timer.start(30000)  # Auto-guardar cada 30 segundos
+        # Menús, barra de estado y carga de personajes se difieren al primer show
+        # (ver showEvent / _post_show_init) para que el primer frame salga antes
+        self._initialized = False
     
     def _setup_ui(self):
         """Configurar la interfaz de usuario principal"""
         self.setWindowTitle("RollForge - Gestor de Personajes")
         
         # Usar el logo del dragón como ícono de la ventana
-        dragon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "dragon.png")
-        if os.path.exists(dragon_path):
-            # Cargar el ícono y agregar múltiples tamaños para mejor calidad
-            icon = QIcon()
-            pixmap = QPixmap(dragon_path)
-            # Agregar versiones en diferentes tamaños (16x16, 32x32, 48x48, 64x64, 128x128)
-            for size in [16, 32, 48, 64, 128]:
-                scaled = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, 
-                                      Qt.TransformationMode.SmoothTransformation)
-                icon.addPixmap(scaled)
-            self.setWindowIcon(icon)
+        if _asset_exists(_DRAGON_PATH):
+            # QIcon basado en archivo: Qt rasteriza solo los tamaños que pide la
+            # plataforma (según DPR) y los cachea él mismo
+            self.setWindowIcon(QIcon(_DRAGON_PATH))
         else:
             self.setWindowIcon(get_default_character_icon())
         
@@ -122,24 +225,23 @@ class MainWindow(QMainWindow):
         self.resize(1600, 900)  # Resolución por defecto: 1600x900
         
         # Widget central con fondo de campfire
-        central_widget = QWidget()
+        central_widget = BackgroundWidget()
         central_widget.setObjectName("centralWidget")
         self.setCentralWidget(central_widget)
         
+        if QPixmapCache.cacheLimit() < _MIN_PIXMAP_CACHE_KB:
+            QPixmapCache.setCacheLimit(_MIN_PIXMAP_CACHE_KB)
+        
         # Configurar imagen de fondo escalada
-        campfire_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "campfire.png")
-        if os.path.exists(campfire_path):
+        if _asset_exists(_CAMPFIRE_PATH):
             # Cargar imagen ORIGINAL una sola vez y guardar en cache
-            self._background_pixmap = QPixmap(campfire_path)
+            self._background_pixmap = QPixmap(_CAMPFIRE_PATH)
             
             # Escalar para el tamaño inicial
-            scaled_pixmap = self._background_pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+            scaled_pixmap = self._scaled_background()
             
-            # Configurar como fondo usando palette
-            palette = central_widget.palette()
-            palette.setBrush(QPalette.ColorRole.Window, QBrush(scaled_pixmap))
-            central_widget.setPalette(palette)
-            central_widget.setAutoFillBackground(True)
+            # Configurar como fondo (lo pinta BackgroundWidget.paintEvent)
+            central_widget.set_background(scaled_pixmap)
         
         # Layout principal
         main_layout = QVBoxLayout(central_widget)
@@ -182,11 +284,9 @@ class MainWindow(QMainWindow):
         # === LOGO DEL DRAGÓN ===
         logo_label = QLabel()
         logo_label.setObjectName("logoLabel")
-        logo_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "dragon.png")
-        if os.path.exists(logo_path):
-            logo_pixmap = QPixmap(logo_path)
-            scaled_logo = logo_pixmap.scaled(48, 48, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            logo_label.setPixmap(scaled_logo)
+        if _asset_exists(_DRAGON_PATH):
+            # El motor de QIcon rasteriza y cachea el tamaño pedido
+            logo_label.setPixmap(QIcon(_DRAGON_PATH).pixmap(48, 48))
         logo_label.setFixedSize(48, 48)
         
         # === TÍTULO ===
@@ -325,8 +425,18 @@ class MainWindow(QMainWindow):
     def _load_characters(self):
         """Cargar todos los personajes desde el almacenamiento"""
         try:
-            self.characters = self.data_manager.load_all_characters()
-            self.character_grid.set_characters(self.characters)
+            with QMutexLocker(self._data_mutex):
+                self.characters = self.data_manager.load_all_characters()
+            self._rebuild_character_index()
+            
+            # Relleno masivo: deshabilitar repintados en el contenedor (el grid no puede
+            # reactivarlos por su cuenta mientras el padre los tenga deshabilitados)
+            self.grid_container.setUpdatesEnabled(False)
+            try:
+                with QSignalBlocker(self.character_grid):
+                    self.character_grid.set_characters(self.characters)
+            finally:
+                self.grid_container.setUpdatesEnabled(True)
             self._update_character_count()
             
             count = len(self.characters)
@@ -346,7 +456,10 @@ class MainWindow(QMainWindow):
             self.current_character_form.close()
         
         self.current_character_form = CharacterForm(self)
-        self.current_character_form.character_saved.connect(self._on_character_saved)
+        # En cola: el formulario termina de cerrarse antes de que se actualice el grid
+        self.current_character_form.character_saved.connect(
+            self._on_character_saved, Qt.ConnectionType.QueuedConnection
+        )
         self.current_character_form.show()
     
     def _edit_character(self, character_id: str):
@@ -361,7 +474,10 @@ class MainWindow(QMainWindow):
             self.current_character_form.close()
         
         self.current_character_form = CharacterForm(self, character)
-        self.current_character_form.character_saved.connect(self._on_character_saved)
+        # En cola: el formulario termina de cerrarse antes de que se actualice el grid
+        self.current_character_form.character_saved.connect(
+            self._on_character_saved, Qt.ConnectionType.QueuedConnection
+        )
         self.current_character_form.show()
     
     def _delete_character(self, character_id: str):
@@ -385,12 +501,14 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 # Eliminar del almacenamiento
-                if self.data_manager.delete_character(character_id):
+                with QMutexLocker(self._data_mutex):
+                    deleted = self.data_manager.delete_character(character_id)
+                if deleted:
                     # Remover del grid
                     self.character_grid.remove_character(character_id)
                     
                     # Actualizar lista local
-                    self.characters = [c for c in self.characters if c.id != character_id]
+                    self._remove_character_from_index(character_id)
                     self._update_character_count()
                     
                     self.status_bar.showMessage(f"Personaje '{character.name}' eliminado correctamente")
@@ -401,30 +519,45 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Error eliminando personaje: {str(e)}")
     
     def _on_character_saved(self, character: Character):
-        """Manejar guardado de personaje (nuevo o editado)"""
+        """Manejar guardado de personaje (nuevo o editado): la E/S se hace en el pool de hilos"""
+        worker = SaveWorker(self.data_manager, character, self._data_mutex)
+        worker.signals.done.connect(self._on_save_complete)
+        self._save_workers[worker.signals] = worker
+        QThreadPool.globalInstance().start(worker)
+        self.status_bar.showMessage(f"Guardando '{character.name}'...")
+    
+    def _on_save_complete(self, character: Character, new_image_path: Optional[str], ok: bool):
+        """Actualizar grid y estado cuando SaveWorker termina (hilo principal)"""
+        self._save_workers.pop(self.sender(), None)
+        
+        # La imagen se copió al directorio de datos: el personaje se actualiza aquí,
+        # en el hilo de la GUI
+        if new_image_path:
+            character.image_path = new_image_path
+        
         try:
-            # Guardar imagen si es necesaria
-            if character.image_path and not character.image_path.startswith(str(self.data_manager.images_dir)):
-                new_image_path = self.data_manager.save_character_image(
-                    character.image_path, 
-                    character.id
-                )
-                if new_image_path:
-                    character.image_path = new_image_path
-            
-            # Guardar personaje
-            if self.data_manager.save_character(character):
-                # Actualizar grid
-                self.character_grid.add_character(character)
+            if ok:
+                existing_index = self._find_character_index(character.id)
+                
+                # Actualizar grid: edición -> solo la tarjeta afectada; nuevo -> agregar tarjeta
+                self.character_grid.setUpdatesEnabled(False)
+                try:
+                    if existing_index >= 0:
+                        self.character_grid.update_character(character)
+                    else:
+                        self.character_grid.add_character(character)
+                finally:
+                    self.character_grid.setUpdatesEnabled(True)
                 
                 # Actualizar lista local
-                existing_index = self._find_character_index(character.id)
                 if existing_index >= 0:
                     self.characters[existing_index] = character
                     action = "actualizado"
                 else:
+                    self._char_index[character.id] = len(self.characters)
                     self.characters.append(character)
                     action = "creado"
+                self._char_by_id[character.id] = character
                 
                 self._update_character_count()
                 self.status_bar.showMessage(f"Personaje '{character.name}' {action} correctamente")
@@ -449,7 +582,9 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                if self.data_manager.export_characters(file_path):
+                with QMutexLocker(self._data_mutex):
+                    exported = self.data_manager.export_characters(file_path)
+                if exported:
                     QMessageBox.information(
                         self, 
                         "Éxito", 
@@ -472,7 +607,9 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                if self.data_manager.import_characters(file_path):
+                with QMutexLocker(self._data_mutex):
+                    imported = self.data_manager.import_characters(file_path)
+                if imported:
                     # Recargar personajes
                     self._load_characters()
                     QMessageBox.information(
@@ -503,14 +640,23 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # Eliminar todos los personajes
-                for character in self.characters[:]:  # Copia para iterar
-                    self.data_manager.delete_character(character.id)
+                # Eliminar todos los personajes (una sola lectura/escritura del archivo)
+                with QMutexLocker(self._data_mutex):
+                    cleared = self.data_manager.delete_all_characters()
+                if not cleared:
+                    QMessageBox.warning(self, "Error", "No se pudieron eliminar los personajes")
+                    return
                 
-                # Limpiar grid y lista
-                self.character_grid.clear_all()
-                self.characters.clear()
-                self._update_character_count()
+                # Limpiar grid y lista sin repintados intermedios
+                self.setUpdatesEnabled(False)
+                try:
+                    self.character_grid.clear_all()
+                    self.characters.clear()
+                    self._char_by_id.clear()
+                    self._char_index.clear()
+                    self._update_character_count()
+                finally:
+                    self.setUpdatesEnabled(True)
                 
                 self.status_bar.showMessage("Todos los personajes han sido eliminados")
                 
@@ -547,25 +693,53 @@ class MainWindow(QMainWindow):
         text = f"{count} personaje" + ("s" if count != 1 else "")
         self.character_count_label.setText(text)
     
+    def _rebuild_character_index(self):
+        """Reconstruir los índices por ID a partir de self.characters"""
+        self._char_by_id = {c.id: c for c in self.characters}
+        self._char_index = {c.id: i for i, c in enumerate(self.characters)}
+    
+    def _remove_character_from_index(self, character_id: str):
+        """Quitar un personaje de la lista y de los índices por ID"""
+        index = self._char_index.pop(character_id, None)
+        if index is None:
+            return
+        self._char_by_id.pop(character_id, None)
+        del self.characters[index]
+        # Solo se desplazan las posiciones posteriores a la eliminada
+        for i in range(index, len(self.characters)):
+            self._char_index[self.characters[i].id] = i
+    
     def _find_character_by_id(self, character_id: str) -> Character:
         """Buscar un personaje por ID"""
-        for character in self.characters:
-            if character.id == character_id:
-                return character
-        return None
+        return self._char_by_id.get(character_id)
     
     def _find_character_index(self, character_id: str) -> int:
         """Buscar el índice de un personaje por ID"""
-        for i, character in enumerate(self.characters):
-            if character.id == character_id:
-                return i
-        return -1
+        return self._char_index.get(character_id, -1)
+    
+    def _background_key(self) -> str:
+        """Clave de QPixmapCache del fondo para el tamaño actual de la ventana"""
+        return f"bg_{self.width()}x{self.height()}"
+    
+    def _scaled_background(self) -> QPixmap:
+        """
+        Obtener el fondo escalado al tamaño actual de la ventana
+        
+        Se cachea en QPixmapCache por tamaño: volver a un tamaño ya visto
+        (maximizar/restaurar, snap) no repite el escalado suave.
+        """
+        key = self._background_key()
+        scaled_pixmap = QPixmap()
+        if not QPixmapCache.find(key, scaled_pixmap):
+            scaled_pixmap = self._background_pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+            QPixmapCache.insert(key, scaled_pixmap)
+        return scaled_pixmap
     
-    def _auto_save(self):
-        """Guardar automáticamente (por si acaso)"""
-        # El auto-guardado ya se maneja en el DataManager
-        # Este es más para futuras funcionalidades
-        pass
+    def _apply_background_rescale(self):
+        """Aplicar el fondo con escalado suave una vez terminado el resize"""
+        central_widget = self.centralWidget()
+        if self._background_pixmap and central_widget:
+            central_widget.set_background(self._scaled_background())
     
     def resizeEvent(self, event):
         """Manejar redimensionamiento de la ventana para ajustar el fondo"""
@@ -575,17 +749,40 @@ class MainWindow(QMainWindow):
         if self._background_pixmap:
             central_widget = self.centralWidget()
             if central_widget:
-                # Usar la imagen cacheada en lugar de recargarla del disco
-                scaled_pixmap = self._background_pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+                # Tamaño ya visto: usar el fondo suave cacheado directamente
+                cached = QPixmap()
+                if QPixmapCache.find(self._background_key(), cached):
+                    self._bg_resize_timer.stop()
+                    central_widget.set_background(cached)
+                    return
                 
-                palette = central_widget.palette()
-                palette.setBrush(QPalette.ColorRole.Window, QBrush(scaled_pixmap))
-                central_widget.setPalette(palette)
+                # Durante el arrastre: vista previa rápida y escalado suave al estabilizarse
+                preview = self._background_pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.FastTransformation)
+                central_widget.set_background(preview)
+                self._bg_resize_timer.start(75)
+    
+    def showEvent(self, event):
+        """Programar la inicialización diferida la primera vez que se muestra la ventana"""
+        super().showEvent(event)
+        if not self._initialized:
+            self._initialized = True
+            QTimer.singleShot(0, self._post_show_init)
+    
+    def _post_show_init(self):
+        """Completar la inicialización una vez visible la ventana"""
+        self._create_menus()
+        self._create_status_bar()
+        
+        # Cargar personajes guardados
+        self._load_characters()
     
     def closeEvent(self, event):
         """Manejar cierre de la aplicación"""
         if self.current_character_form:
             self.current_character_form.close()
         
-        self.status_bar.showMessage("Cerrando aplicación...")
+        if hasattr(self, 'status_bar'):
+            self.status_bar.showMessage("Cerrando aplicación...")
+        # No cerrar con guardados a medio escribir
+        QThreadPool.globalInstance().waitForDone()
         event.accept()
\ No newline at end of file
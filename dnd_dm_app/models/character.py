@@ -4,8 +4,24 @@ Incluye stats, modificadores, clases y sistema de competencias
 """
 
 import uuid
-from typing import Dict, Optional, List
-import math
+from enum import IntEnum
+from typing import Dict, Iterable, Optional, List, Tuple
+
+
+class DndClass(IntEnum):
+    """Identificador entero de cada clase (mismo orden que Character.DND_CLASSES)"""
+    BARBARIAN = 0
+    BARD = 1
+    CLERIC = 2
+    DRUID = 3
+    FIGHTER = 4
+    MONK = 5
+    PALADIN = 6
+    RANGER = 7
+    ROGUE = 8
+    SORCERER = 9
+    WARLOCK = 10
+    WIZARD = 11
 
 
 class Character:
@@ -14,14 +30,29 @@ class Character:
     clase, competencias y modificadores calculados automáticamente
     """
     
-    # Stats básicos de D&D
-    STATS = ['STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA']
+    # Atributos fijos: sin __dict__ por instancia
+    __slots__ = ('id', 'name', 'image_path', 'class_id', '_proficiencies', '_profs_set',
+                 '_packed', '_mod_cache')
+    
+    # Stats básicos de D&D (tupla para el orden de iteración, set para pertenencia)
+    STATS = ('STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA')
+    STATS_SET = frozenset(STATS)
+    
+    # Los 6 stats se guardan empaquetados en un entero, un byte por stat en el orden
+    # de STATS (1-30 cabe en un byte); STAT_SHIFT da el desplazamiento de cada uno
+    STAT_SHIFT = {stat: i * 8 for i, stat in enumerate(STATS)}
+    _DEFAULT_PACKED = int.from_bytes(bytes([10] * len(STATS)), 'little')  # Todos a 10
+    # Máscara para dividir los 6 bytes entre 2 de una vez (sin arrastre entre bytes)
+    _HALF_MASK = int.from_bytes(bytes([0x7F] * len(STATS)), 'little')
     
     # Clases de D&D 5e
     DND_CLASSES = [
         'Barbarian', 'Bard', 'Cleric', 'Druid', 'Fighter', 'Monk', 
         'Paladin', 'Ranger', 'Rogue', 'Sorcerer', 'Warlock', 'Wizard'
     ]
+    DND_CLASSES_SET = frozenset(DND_CLASSES)
+    # Nombre de clase -> DndClass
+    CLASS_INDEX = {name: DndClass(i) for i, name in enumerate(DND_CLASSES)}
     
     # Skills de D&D 5e organizadas por stat
     SKILLS = {
@@ -33,10 +64,12 @@ class Character:
         'CHA': ['Deception', 'Intimidation', 'Performance', 'Persuasion']
     }
     
-    # Lista plana de todas las skills para validación
-    ALL_SKILLS = []
-    for stat_skills in SKILLS.values():
-        ALL_SKILLS.extend(stat_skills)
+    # Todas las skills: tupla inmutable para el orden de visualización, set para validación
+    ALL_SKILLS = tuple(skill for skills in SKILLS.values() for skill in skills)
+    ALL_SKILLS_SET = frozenset(ALL_SKILLS)
+    
+    # Índice inverso skill -> stat base (búsqueda O(1) en get_skill_stat)
+    SKILL_TO_STAT = {skill: stat for stat, skills in SKILLS.items() for skill in skills}
     
     # Rango válido para stats en D&D (típicamente 1-20, pero permite hasta 30 para casos especiales)
     MIN_STAT = 1
@@ -64,10 +97,12 @@ class Character:
         self.id = character_id or str(uuid.uuid4())
         self.name = name
         self.image_path = image_path
-        self._stats = {}
+        self._packed = self._DEFAULT_PACKED
+        # Modificadores calculados (se invalida en set_stat)
+        self._mod_cache: Optional[Dict[str, int]] = None
         
-        # Normalizar clase
-        self.character_class = self._normalize_class(character_class)
+        # Normalizar clase y guardar su identificador entero
+        self.class_id = self.CLASS_INDEX[self._normalize_class(character_class)]
         
         # Asignar proficiencies (ya validadas externamente con validate_character_data)
         self.proficiencies = proficiencies or []
@@ -93,10 +128,36 @@ class Character:
             ValueError: Si la clase no es válida
         """
         normalized = character_class.title()
-        if normalized not in Character.DND_CLASSES:
+        if normalized not in Character.CLASS_INDEX:
             raise ValueError(f"Clase inválida: {character_class}. Debe ser una de {Character.DND_CLASSES}")
         return normalized
     
+    @property
+    def character_class(self) -> str:
+        """Nombre de la clase del personaje"""
+        return self.DND_CLASSES[self.class_id]
+    
+    @character_class.setter
+    def character_class(self, character_class: str):
+        self.class_id = self.CLASS_INDEX[self._normalize_class(character_class)]
+    
+    @property
+    def proficiencies(self) -> Tuple[str, ...]:
+        """
+        Skills con proficiency
+        
+        Tupla inmutable: para modificarlas hay que reasignarlas enteras, así el set
+        usado por has_proficiency nunca queda desincronizado.
+        """
+        return self._proficiencies
+    
+    @proficiencies.setter
+    def proficiencies(self, proficiencies: Iterable[str]):
+        # Copia propia: cambios posteriores en la lista del llamador no afectan
+        self._proficiencies = tuple(proficiencies)
+        # Copia en set para que has_proficiency sea O(1)
+        self._profs_set = frozenset(self._proficiencies)
+    
     def set_stat(self, stat: str, value: int):
         """
         Establecer el valor de un stat con validación
@@ -105,7 +166,7 @@ class Character:
             stat: Nombre del stat (STR, DEX, CON, INT, WIS, CHA)
             value: Valor del stat (1-30)
         """
-        if stat not in self.STATS:
+        if stat not in self.STATS_SET:
             raise ValueError(f"Stat inválido: {stat}. Debe ser uno de {self.STATS}")
         
         if not isinstance(value, int):
@@ -114,7 +175,9 @@ class Character:
         if not (self.MIN_STAT <= value <= self.MAX_STAT):
             raise ValueError(f"El valor del stat {stat} debe estar entre {self.MIN_STAT} y {self.MAX_STAT}")
         
-        self._stats[stat] = value
+        shift = self.STAT_SHIFT[stat]
+        self._packed = (self._packed & ~(0xFF << shift)) | (value << shift)
+        self._mod_cache = None
     
     def get_stat(self, stat: str) -> int:
         """
@@ -126,9 +189,9 @@ class Character:
         Returns:
             Valor del stat
         """
-        if stat not in self.STATS:
+        if stat not in self.STATS_SET:
             raise ValueError(f"Stat inválido: {stat}")
-        return self._stats.get(stat, 10)  # Valor por defecto 10
+        return (self._packed >> self.STAT_SHIFT[stat]) & 0xFF
     
     def get_modifier(self, stat: str) -> int:
         """
@@ -141,8 +204,8 @@ class Character:
         Returns:
             Modificador del stat (-5 a +10 típicamente)
         """
-        stat_value = self.get_stat(stat)
-        return math.floor((stat_value - 10) / 2)
+        # // redondea hacia -infinito, igual que el floor de D&D
+        return (self.get_stat(stat) - 10) // 2
     
     def get_all_stats(self) -> Dict[str, int]:
         """
@@ -151,16 +214,25 @@ class Character:
         Returns:
             Diccionario con todos los stats
         """
-        return self._stats.copy()
+        return dict(zip(self.STATS, self._packed.to_bytes(len(self.STATS), 'little')))
     
     def get_all_modifiers(self) -> Dict[str, int]:
         """
         Obtener todos los modificadores calculados
         
+        El cálculo se cachea hasta el próximo set_stat; se devuelve una copia para
+        que modificarla no altere el cache (ni los dicts de to_dict).
+        
         Returns:
             Diccionario con todos los modificadores
         """
-        return {stat: self.get_modifier(stat) for stat in self.STATS}
+        if self._mod_cache is not None:
+            return dict(self._mod_cache)
+        
+        # floor((v - 10) / 2) == v // 2 - 5: un solo shift divide los 6 bytes a la vez
+        halves = (self._packed >> 1) & self._HALF_MASK
+        self._mod_cache = {stat: half - 5 for stat, half in zip(self.STATS, halves.to_bytes(len(self.STATS), 'little'))}
+        return dict(self._mod_cache)
     
     def has_proficiency(self, skill: str) -> bool:
         """
@@ -172,7 +244,7 @@ class Character:
         Returns:
             True si tiene proficiency, False en caso contrario
         """
-        return skill in self.proficiencies
+        return skill in self._profs_set
     
     def get_skill_stat(self, skill: str) -> str:
         """
@@ -184,10 +256,10 @@ class Character:
         Returns:
             Nombre del stat base (STR, DEX, etc.)
         """
-        for stat, skills in self.SKILLS.items():
-            if skill in skills:
-                return stat
-        raise ValueError(f"Skill inválida: {skill}")
+        try:
+            return self.SKILL_TO_STAT[skill]
+        except KeyError:
+            raise ValueError(f"Skill inválida: {skill}") from None
     
     def calculate_roll_total(self, dice_result: int, skill_or_stat: str, 
                            use_expertise: bool = False) -> Dict[str, int]:
@@ -203,11 +275,11 @@ class Character:
             Diccionario con el desglose completo de la tirada
         """
         # Determinar si es una skill o un stat directo
-        if skill_or_stat in self.ALL_SKILLS:
+        base_stat = self.SKILL_TO_STAT.get(skill_or_stat)
+        if base_stat is not None:
             # Es una skill
-            base_stat = self.get_skill_stat(skill_or_stat)
             is_skill = True
-        elif skill_or_stat in self.STATS:
+        elif skill_or_stat in self.STATS_SET:
             # Es un stat directo
             base_stat = skill_or_stat
             is_skill = False
@@ -217,15 +289,15 @@ class Character:
         # Calcular componentes
         stat_modifier = self.get_modifier(base_stat)
         
+        # Proficiency solo aplica a skills (se consulta una sola vez)
+        has_prof = is_skill and skill_or_stat in self._profs_set
+        
         # Proficiency bonus solo aplica a skills donde el personaje tiene proficiency
-        proficiency_bonus = 0
-        if is_skill and self.has_proficiency(skill_or_stat):
-            proficiency_bonus = self.PROFICIENCY_BONUS
+        proficiency_bonus = self.PROFICIENCY_BONUS if has_prof else 0
         
         # Expertise solo aplica si es Rogue Y tiene proficiency Y se especifica
         expertise_bonus = 0
-        if (use_expertise and self.character_class == 'Rogue' and 
-            is_skill and self.has_proficiency(skill_or_stat)):
+        if use_expertise and has_prof and self.class_id == DndClass.ROGUE:
             expertise_bonus = 2
         
         # Calcular total
@@ -239,9 +311,28 @@ class Character:
             'total': total,
             'base_stat': base_stat,
             'is_skill': is_skill,
-            'has_proficiency': is_skill and self.has_proficiency(skill_or_stat) if is_skill else False
+            'has_proficiency': has_prof
         }
     
+    def calculate_roll_totals_batch(self, dice_results: Iterable[int], skill_or_stat: str,
+                                    use_expertise: bool = False) -> List[int]:
+        """
+        Calcular los totales de muchas tiradas de la misma skill/stat de una vez
+        
+        Los modificadores se resuelven una sola vez; cada tirada solo suma la
+        bonificación constante (útil para simulaciones o probabilidades contra una CD).
+        
+        Args:
+            dice_results: Resultados de los dados
+            skill_or_stat: Nombre de la skill o stat siendo utilizado
+            use_expertise: Si aplicar +2 de expertise (solo para Rogue)
+            
+        Returns:
+            Lista con el total de cada tirada
+        """
+        bonus = self.calculate_roll_total(0, skill_or_stat, use_expertise)['total']
+        return [dice_result + bonus for dice_result in dice_results]
+    
     def to_dict(self) -> Dict:
         """
         Convertir el personaje a un diccionario para serialización
@@ -253,9 +344,9 @@ class Character:
             'id': self.id,
             'name': self.name,
             'character_class': self.character_class,
-            'proficiencies': self.proficiencies.copy(),
+            'proficiencies': list(self._proficiencies),
             'image_path': self.image_path,
-            'stats': self._stats,
+            'stats': self.get_all_stats(),
             'modifiers': self.get_all_modifiers()  # Incluimos modificadores para referencia
         }
     
@@ -279,6 +370,44 @@ class Character:
             character_id=data.get('id')
         )
     
+    @classmethod
+    def _unsafe_from_dict(cls, data: Dict) -> 'Character':
+        """
+        Crear un personaje desde el archivo propio sin pasar por la validación completa
+        
+        Camino rápido para registros ya normalizados (formato de to_dict). Los que no
+        lo están (p. ej. importados sin validar por versiones anteriores: clase en
+        minúsculas, sin id o stats fuera de rango) se delegan a from_dict, que los
+        normaliza o lanza la excepción correspondiente.
+        
+        Args:
+            data: Diccionario con los datos del personaje
+            
+        Returns:
+            Instancia de Character
+        """
+        try:
+            character_id = data['id']
+            class_id = cls.CLASS_INDEX[data.get('character_class', 'Fighter')]
+            stats = data['stats']
+            packed_stats = bytes([stats[stat] for stat in cls.STATS])
+        except (KeyError, TypeError, ValueError):
+            return cls.from_dict(data)
+        
+        # Los modificadores empaquetados y _MOD_STR dependen del rango 1-30
+        if not character_id or min(packed_stats) < cls.MIN_STAT or max(packed_stats) > cls.MAX_STAT:
+            return cls.from_dict(data)
+        
+        character = cls.__new__(cls)
+        character.id = character_id
+        character.name = data['name']
+        character.image_path = data.get('image_path')
+        character.class_id = class_id
+        character.proficiencies = data.get('proficiencies', ())
+        character._packed = int.from_bytes(packed_stats, 'little')
+        character._mod_cache = None
+        return character
+    
     def __str__(self) -> str:
         """Representación en string del personaje"""
         stats_str = ', '.join([f"{stat}: {self.get_stat(stat)} ({self.get_modifier(stat):+d})" 
@@ -287,7 +416,7 @@ class Character:
     
     def __repr__(self) -> str:
         """Representación detallada del personaje"""
-        return f"Character(id='{self.id}', name='{self.name}', class='{self.character_class}', stats={self._stats})"
+        return f"Character(id='{self.id}', name='{self.name}', class='{self.character_class}', stats={self.get_all_stats()})"
 
 
 def validate_character_data(name: str, stats: Dict[str, int], 
@@ -321,7 +450,7 @@ def validate_character_data(name: str, stats: Dict[str, int],
     # Validar proficiencies
     if proficiencies:
         for skill in proficiencies:
-            if skill not in Character.ALL_SKILLS:
+            if skill not in Character.ALL_SKILLS_SET:
                 return False, f"Skill inválida: {skill}. Debe ser una de {Character.ALL_SKILLS}"
     
     # Validar stats
@@ -335,7 +464,7 @@ def validate_character_data(name: str, stats: Dict[str, int],
     
     # Verificar valores de stats
     for stat, value in stats.items():
-        if stat not in Character.STATS:
+        if stat not in Character.STATS_SET:
             return False, f"Stat inválido: {stat}"
         
         if not isinstance(value, int):
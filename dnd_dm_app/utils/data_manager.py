@@ -5,13 +5,69 @@ Maneja carga, guardado y gestión de archivos de personajes
 
 import json
 import os
-import shutil
-from typing import Dict, List, Optional
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 import logging
 
 from models.character import Character
 
+logger = logging.getLogger(__name__)
+
+# orjson (opcional) serializa/parsea en C varias veces más rápido que json;
+# si no está instalado se usa la librería estándar con el mismo formato
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson (opcional) permite recorrer el archivo de personajes sin materializarlo entero
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _dumps(data) -> bytes:
+    """Serializar a JSON UTF-8 con indentación de 2 espacios"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(raw: bytes):
+    """Parsear JSON desde bytes UTF-8"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _copy_file(src: str, dst: str):
+    """
+    Copiar un archivo con sus metadatos (como shutil.copy2)
+    
+    En Linux intenta primero os.copy_file_range: la copia se hace dentro del
+    kernel y en sistemas de archivos CoW (btrfs, XFS) se convierte en un reflink.
+    """
+    # shutil solo se necesita al copiar imágenes: importarlo aquí acelera el arranque
+    import shutil
+    
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # Sin soporte (p.ej. entre sistemas de archivos antiguos): copia normal
+    shutil.copy2(src, dst)
+
 
 class DataManager:
     """
@@ -26,9 +82,8 @@ class DataManager:
         Args:
             data_dir: Directorio donde se almacenan los datos. Si es None, usa el directorio del usuario.
         """
-        # Configurar logging PRIMERO
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        # La configuración global de logging la hace la aplicación (main.py)
+        self.logger = logger
         
         # Si no se especifica directorio, usar el directorio de datos del usuario
         if data_dir is None:
@@ -45,6 +100,15 @@ class DataManager:
         self.characters_file = self.data_dir / "characters.json"
         self.images_dir = self.data_dir / "character_images"
         
+        # Cache del archivo de personajes ya parseado, válido mientras el archivo
+        # no cambie en disco (clave: (st_mtime_ns, st_size))
+        self._cache = None
+        self._cache_stat = None
+        self._cache_lock = threading.Lock()
+        
+        # El backup de un archivo corrupto se hace una sola vez por sesión
+        self._corrupt_backup_done = False
+        
         self.logger.info(f"Directorio de datos: {self.data_dir}")
         
         # Crear directorios si no existen (ahora que logger está disponible)
@@ -83,35 +147,100 @@ class DataManager:
         Args:
             characters_data: Diccionario con todos los personajes
         """
-        try:
-            with open(self.characters_file, 'w', encoding='utf-8') as f:
-                json.dump(characters_data, f, indent=2, ensure_ascii=False)
-        except (IOError, json.JSONEncodeError) as e:
-            self.logger.error(f"Error guardando archivo de personajes: {e}")
-            raise
+        with self._cache_lock:
+            try:
+                raw = _dumps(characters_data)
+                # Escritura atómica: archivo temporal + os.replace, así un fallo a
+                # mitad de escritura nunca deja el archivo de personajes corrupto
+                tmp_path = self.characters_file.with_suffix('.json.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(raw)
+                os.replace(tmp_path, self.characters_file)
+            except (IOError, TypeError, ValueError) as e:
+                # El cache puede haberse modificado antes del fallo: descartarlo
+                self._cache = None
+                self._cache_stat = None
+                self.logger.error(f"Error guardando archivo de personajes: {e}")
+                raise
+            
+            # Lo recién escrito pasa a ser el cache: la siguiente carga no relee el archivo
+            st = os.stat(self.characters_file)
+            self._cache = characters_data
+            self._cache_stat = (st.st_mtime_ns, st.st_size)
     
     def _load_characters_file(self) -> Dict:
         """
         Cargar el archivo principal de personajes
         
+        El resultado se cachea mientras el archivo no cambie (mtime y tamaño); los
+        llamadores que lo modifican deben guardarlo después con _save_characters_file.
+        
         Returns:
             Diccionario con todos los personajes
         """
         try:
-            if not self.characters_file.exists():
-                return {}
-            
-            with open(self.characters_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with self._cache_lock:
+                try:
+                    st = os.stat(self.characters_file)
+                except FileNotFoundError:
+                    self._cache = None
+                    self._cache_stat = None
+                    return {}
+                
+                stat_key = (st.st_mtime_ns, st.st_size)
+                if self._cache is not None and stat_key == self._cache_stat:
+                    return self._cache
+                
+                with open(self.characters_file, 'rb') as f:
+                    data = _loads(f.read())
+                self._cache = data
+                self._cache_stat = stat_key
+                return data
         except (IOError, json.JSONDecodeError) as e:
             self.logger.error(f"Error cargando archivo de personajes: {e}")
-            # Crear backup del archivo corrupto
-            if self.characters_file.exists():
+            # Crear backup del archivo corrupto (solo la primera vez: las escrituras
+            # son atómicas, así que la corrupción solo puede venir de fuera)
+            if not self._corrupt_backup_done and self.characters_file.exists():
+                self._corrupt_backup_done = True
                 backup_path = self.characters_file.with_suffix('.json.backup')
+                import shutil
                 shutil.copy2(self.characters_file, backup_path)
                 self.logger.info(f"Backup creado en: {backup_path}")
             return {}
     
+    def _cache_is_fresh(self) -> bool:
+        """Comprobar si el cache corresponde al archivo actual en disco"""
+        with self._cache_lock:
+            if self._cache is None:
+                return False
+            try:
+                st = os.stat(self.characters_file)
+            except OSError:
+                return False
+            return (st.st_mtime_ns, st.st_size) == self._cache_stat
+    
+    def iter_character_dicts(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Recorrer los personajes guardados como pares (id, diccionario)
+        
+        Si el archivo ya está en cache se recorre el cache; si no y ijson está
+        disponible, se lee en streaming (un registro en memoria a la vez).
+        
+        Yields:
+            Tuplas (id, diccionario del personaje)
+        """
+        if ijson is None or self._cache_is_fresh():
+            yield from self._load_characters_file().items()
+            return
+        
+        try:
+            with open(self.characters_file, 'rb') as f:
+                yield from ijson.kvitems(f, '')
+        except (OSError, ijson.JSONError) as e:
+            # Archivo ausente o corrupto: la carga completa crea el backup y devuelve {}
+            self.logger.warning(f"Error leyendo personajes en streaming: {e}")
+            yield from self._load_characters_file().items()
+    
     def save_character(self, character: Character) -> bool:
         """
         Guardar un personaje individual
@@ -134,6 +263,31 @@ class DataManager:
             self.logger.error(f"Error guardando personaje {character.name}: {e}")
             return False
     
+    def save_characters(self, characters: Iterable[Character]) -> int:
+        """
+        Guardar varios personajes con una sola lectura y una sola escritura del archivo
+        
+        Args:
+            characters: Personajes a guardar
+            
+        Returns:
+            Número de personajes guardados (0 si hubo error)
+        """
+        try:
+            characters_data = self._load_characters_file()
+            count = 0
+            for character in characters:
+                characters_data[character.id] = character.to_dict()
+                count += 1
+            self._save_characters_file(characters_data)
+            
+            self.logger.info(f"Guardados {count} personajes")
+            return count
+            
+        except Exception as e:
+            self.logger.error(f"Error guardando personajes: {e}")
+            return 0
+    
     def load_character(self, character_id: str) -> Optional[Character]:
         """
         Cargar un personaje específico por ID
@@ -142,7 +296,8 @@ class DataManager:
             character_id: ID único del personaje
             
         Returns:
-            Instancia del personaje o None si no se encuentra
+            Instancia nueva del personaje (modificarla no afecta a otras llamadas)
+            o None si no se encuentra
         """
         try:
             characters_data = self._load_characters_file()
@@ -150,8 +305,8 @@ class DataManager:
             if character_id not in characters_data:
                 return None
             
-            character_dict = characters_data[character_id]
-            return Character.from_dict(character_dict)
+            # Desde el dict ya cacheado (datos propios, normalizados): sin releer ni revalidar
+            return Character._unsafe_from_dict(characters_data[character_id])
             
         except Exception as e:
             self.logger.error(f"Error cargando personaje {character_id}: {e}")
@@ -165,12 +320,12 @@ class DataManager:
             Lista de todos los personajes
         """
         try:
-            characters_data = self._load_characters_file()
             characters = []
             
-            for character_dict in characters_data.values():
+            for character_id, character_dict in self.iter_character_dicts():
                 try:
-                    character = Character.from_dict(character_dict)
+                    # Datos propios (validados al guardar o importar): sin revalidar
+                    character = Character._unsafe_from_dict(character_dict)
                     characters.append(character)
                 except Exception as e:
                     self.logger.warning(f"Error cargando personaje individual: {e}")
@@ -216,6 +371,34 @@ class DataManager:
             self.logger.error(f"Error eliminando personaje {character_id}: {e}")
             return False
     
+    def delete_all_characters(self) -> bool:
+        """
+        Eliminar todos los personajes en una sola operación
+        
+        Lee y reescribe el archivo de datos una única vez, en lugar de una vez
+        por personaje como haría llamar a delete_character en bucle.
+        
+        Returns:
+            True si se eliminaron correctamente, False en caso contrario
+        """
+        try:
+            characters_data = self._load_characters_file()
+            
+            # Eliminar imágenes asociadas
+            for character_dict in characters_data.values():
+                if character_dict.get('image_path'):
+                    self._delete_character_image(character_dict['image_path'])
+            
+            # Una sola escritura del archivo de datos
+            self._save_characters_file({})
+            
+            self.logger.info(f"Eliminados {len(characters_data)} personajes")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error eliminando todos los personajes: {e}")
+            return False
+    
     def save_character_image(self, image_path: str, character_id: str) -> Optional[str]:
         """
         Copiar y guardar la imagen de un personaje en el directorio de datos
@@ -243,7 +426,7 @@ class DataManager:
             new_path = self.images_dir / new_filename
             
             # Copiar archivo
-            shutil.copy2(image_path, new_path)
+            _copy_file(image_path, new_path)
             
             self.logger.info(f"Imagen guardada: {new_path}")
             return str(new_path)
@@ -292,8 +475,8 @@ class DataManager:
         try:
             characters_data = self._load_characters_file()
             
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(characters_data, f, indent=2, ensure_ascii=False)
+            with open(export_path, 'wb') as f:
+                f.write(_dumps(characters_data))
             
             self.logger.info(f"Personajes exportados a: {export_path}")
             return True
@@ -317,19 +500,44 @@ class DataManager:
                 self.logger.error(f"Archivo de importación no encontrado: {import_path}")
                 return False
             
-            with open(import_path, 'r', encoding='utf-8') as f:
-                imported_data = json.load(f)
+            with open(import_path, 'rb') as f:
+                imported_data = _loads(f.read())
             
             # Validar estructura de datos
             if not isinstance(imported_data, dict):
                 self.logger.error("El archivo de importación no tiene el formato correcto")
                 return False
             
+            # Validar los stats de todos los personajes en una sola pasada: array('h')
+            # rechaza valores no enteros y min/max comprueban el rango en C
+            try:
+                all_stats = array('h', (
+                    character_dict['stats'][stat]
+                    for character_dict in imported_data.values()
+                    for stat in Character.STATS
+                ))
+            except (KeyError, TypeError, OverflowError):
+                self.logger.error("El archivo de importación contiene stats faltantes o inválidos")
+                return False
+            if all_stats and (min(all_stats) < Character.MIN_STAT or max(all_stats) > Character.MAX_STAT):
+                self.logger.error(
+                    f"El archivo de importación contiene stats fuera del rango "
+                    f"{Character.MIN_STAT}-{Character.MAX_STAT}"
+                )
+                return False
+            
             # Cargar datos existentes
             existing_data = self._load_characters_file()
             
+            # Validar cada personaje importado con from_dict (datos externos) y
+            # guardarlo normalizado, para que las cargas posteriores puedan confiar en él
+            validated_data = {}
+            for character_dict in imported_data.values():
+                character = Character.from_dict(character_dict)
+                validated_data[character.id] = character.to_dict()
+            
             # Fusionar datos (los importados tienen prioridad)
-            existing_data.update(imported_data)
+            existing_data.update(validated_data)
             
             # Guardar datos fusionados
             self._save_characters_file(existing_data)
@@ -1,14 +1,185 @@
 """
 Utilidades para el manejo de imágenes en la aplicación
+
+Pillow se importa dentro de las funciones que lo usan (igual que QPainter/QPen en
+el fallback del placeholder): importar este módulo no carga PIL, así el arranque
+no paga su inicialización si la primera pantalla no muestra imágenes.
 """
 
 import os
-from typing import Optional, Tuple
-from PIL import Image, ImageQt
-from PySide6.QtGui import QPixmap, QIcon
-from PySide6.QtCore import Qt
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+from PySide6.QtGui import QImage, QPixmap, QIcon
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
 import logging
 
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Placeholders ya generados por (tamaño, texto); se devuelven copias (compartición
+# implícita de Qt) para que cambiar el devicePixelRatio no altere el cache
+# (limitado: el ancho de las tarjetas cambia al redimensionar la ventana)
+_placeholder_cache = {}
+_PLACEHOLDER_CACHE_MAX = 32
+
+# Imagen pfp_placeholder.png ya decodificada (se carga una sola vez)
+_placeholder_src_img = None
+
+# Modos PIL que QImage acepta sin conversión: modo -> (formato, bytes por píxel)
+_QT_FORMATS = {
+    'RGB': (QImage.Format.Format_RGB888, 3),
+    'RGBA': (QImage.Format.Format_RGBA8888, 4),
+    'L': (QImage.Format.Format_Grayscale8, 1),
+}
+
+# Rutas de recursos (calculadas una sola vez)
+_ASSETS_DIR = Path(__file__).resolve().parents[2] / 'assets'
+_PLACEHOLDER_PATH = _ASSETS_DIR / 'pfp_placeholder.png'
+
+# Borde del placeholder generado
+_PLACEHOLDER_BORDER_COLOR = (74, 77, 90)
+_PLACEHOLDER_BORDER_WIDTH = 2
+
+# Patrón del placeholder de emergencia (si Pillow falla): tile de líneas diagonales
+_FALLBACK_TILE_SIZE = 20
+_fallback_brush = None
+
+# Lado máximo (px) hasta el que se redimensiona con BILINEAR en vez de LANCZOS
+_THUMBNAIL_MAX_SIDE = 256
+
+
+def _fallback_pattern_brush():
+    """
+    Obtener el QBrush del patrón diagonal del placeholder de emergencia
+    
+    El tile (una diagonal cada _FALLBACK_TILE_SIZE px) se dibuja una sola vez; crearlo
+    requiere la QApplication, por eso se genera en el primer uso.
+    """
+    global _fallback_brush
+    if _fallback_brush is None:
+        from PySide6.QtGui import QBrush, QPainter, QPen
+        
+        side = _FALLBACK_TILE_SIZE
+        tile = QPixmap(side, side)
+        tile.fill(Qt.GlobalColor.darkGray)
+        painter = QPainter(tile)
+        painter.setPen(QPen(Qt.GlobalColor.gray, 1))
+        painter.drawLine(side - 1, 0, 0, side - 1)
+        painter.end()
+        _fallback_brush = QBrush(tile)
+    return _fallback_brush
+
+
+def _placeholder_background(width: int, height: int) -> "Image.Image":
+    """
+    Generar el fondo del placeholder (gradiente vertical + borde) en una sola pasada
+    
+    El gradiente solo tiene ~20 tonos: cada fila distinta (con el borde lateral ya
+    incluido) se construye una vez y el buffer completo sale de un único b''.join.
+    """
+    from PIL import Image
+    
+    border_color = _PLACEHOLDER_BORDER_COLOR
+    border_width = _PLACEHOLDER_BORDER_WIDTH
+    inner = width - 2 * border_width
+    if inner <= 0 or height <= 2 * border_width:
+        # Demasiado pequeño: todo es borde
+        return Image.new('RGB', (width, height), border_color)
+    
+    border = bytes(border_color)
+    border_row = border * width
+    edge = border * border_width
+    
+    rows = [border_row] * border_width
+    shade_rows = {}
+    for i in range(border_width, height - border_width):
+        shade = 45 + (i * 20) // height
+        row = shade_rows.get(shade)
+        if row is None:
+            row = shade_rows[shade] = edge + bytes((shade, shade + 7, shade + 27)) * inner + edge
+        rows.append(row)
+    rows += [border_row] * border_width
+    return Image.frombytes('RGB', (width, height), b''.join(rows))
+
+
+def _raw_image_data(img: "Image.Image"):
+    """
+    Obtener los bytes crudos de una imagen PIL y el formato QImage equivalente
+    
+    Returns:
+        (buffer, ancho, alto, bytes por línea, formato QImage)
+    """
+    if img.mode not in _QT_FORMATS:
+        img = img.convert('RGBA')
+    qt_format, channels = _QT_FORMATS[img.mode]
+    
+    width, height = img.size
+    return img.tobytes('raw', img.mode), width, height, channels * width, qt_format
+
+
+def _pil_to_pixmap(img: "Image.Image") -> QPixmap:
+    """
+    Convertir una imagen PIL a QPixmap construyendo el QImage sobre sus bytes crudos
+    
+    QPixmap.fromImage copia los píxeles, así que el buffer solo tiene que vivir
+    durante la conversión.
+    """
+    buffer, width, height, stride, qt_format = _raw_image_data(img)
+    return QPixmap.fromImage(QImage(buffer, width, height, stride, qt_format))
+
+
+def _pil_to_qimage(img: "Image.Image") -> QImage:
+    """Convertir una imagen PIL a un QImage con copia propia de los píxeles (usable en otro hilo)"""
+    buffer, width, height, stride, qt_format = _raw_image_data(img)
+    return QImage(buffer, width, height, stride, qt_format).copy()
+
+
+class _ImageLoadSignals(QObject):
+    """
+    Entrega en el hilo de la GUI el resultado de un _ImageLoadTask
+    
+    Se crea en el hilo principal, así que la conexión loaded -> _deliver queda en
+    cola: el QPixmap se construye siempre en el hilo de la GUI.
+    """
+    loaded = Signal(QImage)
+    
+    def __init__(self, on_ready: Callable[[Optional[QPixmap]], None]):
+        super().__init__()
+        self._on_ready = on_ready
+        self.loaded.connect(self._deliver)
+    
+    def _deliver(self, image: QImage):
+        _pending_image_loads.discard(self)
+        self._on_ready(None if image.isNull() else QPixmap.fromImage(image))
+
+
+class _ImageLoadTask(QRunnable):
+    """Decodifica y escala una imagen con Pillow fuera del hilo de la GUI"""
+    
+    def __init__(self, file_path: str, size: Optional[Tuple[int, int]], signals: _ImageLoadSignals):
+        super().__init__()
+        self.file_path = file_path
+        self.size = size
+        self.signals = signals
+    
+    def run(self):
+        from PIL import UnidentifiedImageError
+        
+        image = QImage()
+        if ImageUtils._is_supported_file(self.file_path):
+            try:
+                image = _pil_to_qimage(ImageUtils._decode_image(self.file_path, self.size))
+            except (UnidentifiedImageError, OSError) as e:
+                logging.warning(f"Imagen no válida {self.file_path}: {e}")
+            except Exception as e:
+                logging.error(f"Error cargando imagen {self.file_path}: {e}")
+        self.signals.loaded.emit(image)
+
+
+# Señales de cargas en curso (mantenerlas vivas hasta entregar el resultado)
+_pending_image_loads = set()
+
 
 class ImageUtils:
     """Utilidades para manejo de imágenes"""
@@ -20,26 +191,34 @@ class ImageUtils:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
+    @staticmethod
+    def _is_supported_file(file_path: str) -> bool:
+        """Comprobación barata: el archivo existe y tiene una extensión soportada"""
+        if not os.path.exists(file_path):
+            return False
+        return os.path.splitext(file_path)[1].lower() in ImageUtils.SUPPORTED_FORMATS
+    
     @staticmethod
     def is_valid_image(file_path: str) -> bool:
         """
         Verificar si un archivo es una imagen válida
         
+        Validación completa (abre y ejecuta verify() de Pillow): usar al elegir o
+        registrar una imagen, no en cada carga; load_pixmap ya falla con None si la
+        imagen no se puede decodificar.
+        
         Args:
             file_path: Ruta del archivo a verificar
             
         Returns:
             True si es una imagen válida
         """
-        if not os.path.exists(file_path):
-            return False
-        
-        # Verificar extensión
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext not in ImageUtils.SUPPORTED_FORMATS:
+        # Verificar existencia y extensión
+        if not ImageUtils._is_supported_file(file_path):
             return False
         
         # Verificar que se puede abrir como imagen
+        from PIL import Image
         try:
             with Image.open(file_path) as img:
                 img.verify()
@@ -59,42 +238,95 @@ class ImageUtils:
         Returns:
             QPixmap o None si hay error
         """
+        if not ImageUtils._is_supported_file(file_path):
+            return None
+        
+        from PIL import UnidentifiedImageError
         try:
-            if not ImageUtils.is_valid_image(file_path):
-                return None
-            
-            # Cargar y procesar imagen
-            with Image.open(file_path) as img:
-                # Convertir a RGB si es necesario
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGB')
-                
-                # Redimensionar si se especifica tamaño
-                if size:
-                    img = ImageUtils._resize_with_aspect_ratio(img, size)
-                
-                # Convertir a QPixmap
-                qt_image = ImageQt.ImageQt(img)
-                pixmap = QPixmap.fromImage(qt_image)
-                
-                return pixmap
+            # Convertir a QPixmap
+            return _pil_to_pixmap(ImageUtils._decode_image(file_path, size))
                 
+        except (UnidentifiedImageError, OSError) as e:
+            logging.warning(f"Imagen no válida {file_path}: {e}")
+            return None
         except Exception as e:
             logging.error(f"Error cargando imagen {file_path}: {e}")
             return None
     
     @staticmethod
-    def _resize_with_aspect_ratio(img: Image.Image, target_size: Tuple[int, int]) -> Image.Image:
+    def load_pixmap_async(file_path: str, size: Optional[Tuple[int, int]],
+                          on_ready: Callable[[Optional[QPixmap]], None]):
+        """
+        Cargar una imagen como QPixmap en el pool de hilos
+        
+        La decodificación y el escalado (Pillow) se hacen en un hilo del pool; el
+        QPixmap se crea en el hilo de la GUI y se entrega a on_ready (None si hay error).
+        Debe llamarse desde el hilo de la GUI.
+        
+        Args:
+            file_path: Ruta de la imagen
+            size: Tamaño deseado (ancho, alto) o None para tamaño original
+            on_ready: Callback que recibe el QPixmap resultante
+        """
+        signals = _ImageLoadSignals(on_ready)
+        _pending_image_loads.add(signals)
+        QThreadPool.globalInstance().start(_ImageLoadTask(file_path, size, signals))
+    
+    @staticmethod
+    def _decode_image(file_path: str, size: Optional[Tuple[int, int]]) -> "Image.Image":
+        """
+        Abrir, decodificar y escalar una imagen con Pillow (seguro fuera del hilo de la GUI)
+        
+        Raises:
+            UnidentifiedImageError, OSError: Si el archivo no es una imagen válida
+        """
+        from PIL import Image, ImageOps
+        
+        # Una sola apertura: si no es una imagen válida, Image.open o la
+        # decodificación lanzan UnidentifiedImageError/OSError
+        with Image.open(file_path) as img:
+            # JPEG: pedir a libjpeg que decodifique ya reducido (escalado DCT
+            # 1/2, 1/4 o 1/8, nunca por debajo del tamaño pedido)
+            if size and img.format == 'JPEG':
+                img.draft('RGB', size)
+            
+            # Aplicar la orientación EXIF (fotos de cámara/móvil)
+            img = ImageOps.exif_transpose(img)
+            
+            # Convertir solo los modos sin formato QImage equivalente (RGB, RGBA y L
+            # pasan tal cual); las paletas se expanden a RGBA una vez, conservando la
+            # transparencia y evitando que el resize caiga a NEAREST
+            if img.mode not in _QT_FORMATS:
+                img = img.convert('RGBA' if img.mode in ('P', 'PA', 'LA') else 'RGB')
+            
+            # Redimensionar si se especifica tamaño
+            if size:
+                img = ImageUtils._resize_with_aspect_ratio(img, size)
+            
+            # Asegurar los píxeles en memoria antes de cerrar el archivo
+            img.load()
+            return img
+    
+    @staticmethod
+    def _resize_with_aspect_ratio(img: "Image.Image", target_size: Tuple[int, int],
+                                  resample: Optional[int] = None) -> "Image.Image":
         """
         Redimensionar imagen manteniendo proporción
         
+        Sin filtro explícito se usa BILINEAR para miniaturas (lado <= 256 px, donde no
+        se distingue de LANCZOS y es varias veces más rápido) y LANCZOS para el resto.
+        Instalar pillow-simd en lugar de Pillow acelera ambos filtros sin cambiar código.
+        
         Args:
             img: Imagen PIL
             target_size: Tamaño objetivo (ancho, alto)
+            resample: Filtro de remuestreo de Pillow o None para elegirlo por tamaño
             
         Returns:
             Imagen redimensionada
         """
+        from PIL import Image
+        
         target_width, target_height = target_size
         img_width, img_height = img.size
         
@@ -106,7 +338,10 @@ class ImageUtils:
         new_height = int(img_height * ratio)
         
         # Redimensionar
-        img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        if resample is None:
+            resample = (Image.Resampling.BILINEAR if max(target_size) <= _THUMBNAIL_MAX_SIDE
+                        else Image.Resampling.LANCZOS)
+        img_resized = img.resize((new_width, new_height), resample)
         
         # Crear imagen final centrada en el tamaño objetivo
         final_img = Image.new('RGBA', target_size, (0, 0, 0, 0))
@@ -131,91 +366,81 @@ class ImageUtils:
         Returns:
             QPixmap placeholder
         """
+        key = (tuple(size), text)
+        cached = _placeholder_cache.get(key)
+        if cached is not None:
+            return QPixmap(cached)
+        
+        pixmap = ImageUtils._build_placeholder_pixmap(size, text)
+        if len(_placeholder_cache) >= _PLACEHOLDER_CACHE_MAX:
+            # Descartar la entrada más antigua (orden de inserción)
+            del _placeholder_cache[next(iter(_placeholder_cache))]
+        _placeholder_cache[key] = pixmap
+        return QPixmap(pixmap)
+    
+    @staticmethod
+    def _build_placeholder_pixmap(size: Tuple[int, int], text: str) -> QPixmap:
+        """Generar el placeholder (sin cache); ver create_placeholder_pixmap"""
+        global _placeholder_src_img
         try:
+            from PIL import Image
+            
             # Intentar cargar el placeholder desde assets
-            placeholder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "pfp_placeholder.png")
+            if _placeholder_src_img is None and _PLACEHOLDER_PATH.is_file():
+                # Decodificar el PNG una sola vez y conservarlo en memoria
+                with Image.open(_PLACEHOLDER_PATH) as src:
+                    src.load()
+                    _placeholder_src_img = src.copy()
             
-            if os.path.exists(placeholder_path):
-                # Cargar la imagen placeholder
-                img = Image.open(placeholder_path)
-                
+            if _placeholder_src_img is not None:
                 # Redimensionar manteniendo proporción
-                img = ImageUtils._resize_with_aspect_ratio(img, size)
+                img = ImageUtils._resize_with_aspect_ratio(_placeholder_src_img, size)
                 
                 # Convertir a QPixmap
-                qt_image = ImageQt.ImageQt(img)
-                pixmap = QPixmap.fromImage(qt_image)
+                pixmap = _pil_to_pixmap(img)
                 return pixmap
             
             # Si no existe el archivo, crear placeholder con gradiente
-            from PIL import ImageDraw, ImageFont
+            from PIL import ImageDraw
             
-            # Crear imagen placeholder con gradiente
-            img = Image.new('RGB', size, color=(45, 52, 72))
-            draw = ImageDraw.Draw(img)
-            
-            # Crear un gradiente simple
+            # Crear imagen placeholder con gradiente vertical y borde (ya compuestos
+            # en el buffer: ImageDraw solo hace falta para el texto)
             width, height = size
-            for i in range(height):
-                shade = int(45 + (i / height) * 20)
-                color = (shade, shade + 7, shade + 27)
-                draw.line([(0, i), (width, i)], fill=color)
-            
-            # Dibujar borde
-            border_color = (74, 77, 90)
-            draw.rectangle([0, 0, width-1, height-1], outline=border_color, width=2)
+            img = _placeholder_background(width, height)
             
             # Intentar agregar texto
             try:
-                # Usar fuente por defecto
-                font_size = max(10, min(size) // 8)
-                
-                # Calcular posición del texto
-                lines = text.split('\n')
-                line_height = font_size + 2
-                total_text_height = len(lines) * line_height
-                start_y = (height - total_text_height) // 2
-                
-                for i, line in enumerate(lines):
-                    # Calcular ancho del texto aproximado
-                    text_width = len(line) * (font_size * 0.6)
-                    text_x = (width - text_width) // 2
-                    text_y = start_y + (i * line_height)
+                if text:
+                    draw = ImageDraw.Draw(img)
                     
-                    # Dibujar texto con sombra
+                    # Medir el bloque completo con la métrica real de la fuente por defecto
+                    left, top, right, bottom = draw.multiline_textbbox((0, 0), text, spacing=2, align='center')
+                    text_x = (width - (right - left)) // 2 - left
+                    text_y = (height - (bottom - top)) // 2 - top
+                    
+                    # Dibujar texto con sombra (una llamada por capa, sin importar las líneas)
                     shadow_color = (20, 20, 20)
                     text_color = (200, 200, 210)
                     
-                    draw.text((text_x + 1, text_y + 1), line, fill=shadow_color)
-                    draw.text((text_x, text_y), line, fill=text_color)
+                    draw.multiline_text((text_x + 1, text_y + 1), text, fill=shadow_color, spacing=2, align='center')
+                    draw.multiline_text((text_x, text_y), text, fill=text_color, spacing=2, align='center')
                     
             except Exception:
                 # Si falla el texto, continuar sin él
                 pass
             
             # Convertir a QPixmap
-            qt_image = ImageQt.ImageQt(img)
-            pixmap = QPixmap.fromImage(qt_image)
+            pixmap = _pil_to_pixmap(img)
             
             return pixmap
             
         except Exception:
-            # Fallback: crear QPixmap básico con patrón
+            # Fallback: crear QPixmap básico con patrón de líneas diagonales
+            # (un solo fillRect con el brush de tile, sin dibujar línea a línea)
+            from PySide6.QtGui import QPainter
             pixmap = QPixmap(*size)
-            pixmap.fill(Qt.GlobalColor.darkGray)
-            
-            # Dibujar patrón simple
-            from PySide6.QtGui import QPainter, QPen
             painter = QPainter(pixmap)
-            pen = QPen(Qt.GlobalColor.gray)
-            pen.setWidth(1)
-            painter.setPen(pen)
-            
-            # Dibujar líneas diagonales
-            for i in range(0, max(size), 20):
-                painter.drawLine(i, 0, 0, i)
-                painter.drawLine(size[0], i, i, size[1])
-            
+            painter.fillRect(pixmap.rect(), _fallback_pattern_brush())
             painter.end()
             return pixmap
     
@@ -230,17 +455,25 @@ class ImageUtils:
         Returns:
             Diccionario con información o None si hay error
         """
+        if os.path.splitext(file_path)[1].lower() not in ImageUtils.SUPPORTED_FORMATS:
+            return None
+        
+        # Un solo stat para existencia y tamaño
         try:
-            if not ImageUtils.is_valid_image(file_path):
-                return None
-            
+            file_size = os.stat(file_path).st_size
+        except OSError:
+            return None
+        
+        from PIL import Image
+        try:
+            # Image.open solo lee la cabecera: no decodifica píxeles ni hace verify()
             with Image.open(file_path) as img:
                 info = {
                     'width': img.width,
                     'height': img.height,
                     'mode': img.mode,
                     'format': img.format,
-                    'size_mb': os.path.getsize(file_path) / (1024 * 1024)
+                    'size_mb': file_size / (1024 * 1024)
                 }
                 return info
                 
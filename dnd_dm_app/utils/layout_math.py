@@ -0,0 +1,89 @@
+"""
+Geometría del grid de tarjetas (funciones puras, sin Qt)
+"""
+
+import functools
+from array import array
+
+# Constantes del layout flexbox de tarjetas
+MIN_CARD_WIDTH = 200   # Ancho mínimo de cada tarjeta
+MAX_CARD_WIDTH = 400   # Ancho máximo de cada tarjeta
+MAX_CARDS_PER_ROW = 5  # Tope de tarjetas por fila
+MARGIN = 40            # Márgenes laterales total
+SPACING = 15           # Espacio entre tarjetas
+MIN_ROW_HEIGHT = 300   # Altura mínima de cada fila
+ROW_MARGIN = 30        # Margen vertical total del grid
+
+
+def _row_bounds(available_width: int):
+    """
+    Límites de tarjetas por fila para un ancho dado
+
+    Returns:
+        (mínimo por ancho máximo de tarjeta, máximo por ancho mínimo con tope MAX_CARDS_PER_ROW)
+    """
+    effective_width = available_width - MARGIN
+
+    # Cuántas tarjetas caben con el ancho mínimo
+    max_possible_cards = (effective_width + SPACING) // (MIN_CARD_WIDTH + SPACING)
+
+    # Cuántas tarjetas caben con el ancho máximo
+    min_possible_cards = max(1, (effective_width + SPACING) // (MAX_CARD_WIDTH + SPACING))
+
+    return min_possible_cards, min(max_possible_cards, MAX_CARDS_PER_ROW)
+
+
+# Límites precalculados para cada ancho de 0 a _TABLE_WIDTH - 1 px (un byte por ancho)
+_TABLE_WIDTH = 4096
+_MIN_CARDS_TABLE = array('B')
+_MAX_CARDS_TABLE = array('B')
+for _width in range(_TABLE_WIDTH):
+    _low, _high = _row_bounds(_width)
+    _MIN_CARDS_TABLE.append(_low)
+    _MAX_CARDS_TABLE.append(max(0, _high))
+del _width, _low, _high
+
+
+def cards_per_row(available_width: int, n_cards: int) -> int:
+    """
+    Calcular el número óptimo de tarjetas por fila
+
+    Args:
+        available_width: Ancho disponible del viewport
+        n_cards: Número total de tarjetas
+
+    Returns:
+        Tarjetas por fila (al menos 1)
+    """
+    if 0 <= available_width < _TABLE_WIDTH:
+        min_possible_cards = _MIN_CARDS_TABLE[available_width]
+        max_possible_cards = _MAX_CARDS_TABLE[available_width]
+    else:
+        min_possible_cards, max_possible_cards = _row_bounds(available_width)
+
+    return max(min_possible_cards, min(max_possible_cards, n_cards))
+
+
+def row_height(available_height: int, total_rows: int):
+    """
+    Calcular la altura de cada fila para maximizar el uso del espacio vertical
+
+    Returns:
+        Altura por fila o None si no hay altura disponible
+    """
+    if not available_height or total_rows <= 0:
+        return None
+    return max(MIN_ROW_HEIGHT, (available_height - ROW_MARGIN) // total_rows)
+
+
+@functools.lru_cache(maxsize=256)
+def card_width(available_width: int, cards_in_row: int) -> int:
+    """
+    Calcular el ancho de una tarjeta según cuántas comparten su fila
+
+    Returns:
+        Ancho limitado a [MIN_CARD_WIDTH, MAX_CARD_WIDTH]
+    """
+    total_spacing = (cards_in_row - 1) * SPACING
+    width = (available_width - MARGIN - total_spacing) // cards_in_row
+    return max(MIN_CARD_WIDTH, min(MAX_CARD_WIDTH, width))
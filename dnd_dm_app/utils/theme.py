@@ -16,7 +16,8 @@ TRANSPARENCIAS:
 NOTAS IMPORTANTES:
 1. Qt 6+ soporta rgba() en StyleSheets (funciona correctamente)
 2. El grid container usa TransparentWidget con estilo inline
-3. Las tarjetas aplican transparencia directamente en CSS
+3. Las tarjetas aplican transparencia directamente en CSS (hoja única en el
+   contenedor de tarjetas del grid, con selectores acotados a CharacterCard)
 4. Los estilos inline se aplican DESPUÉS del tema global
 
 ============================================================
@@ -55,26 +56,25 @@ THEME_COLORS = {
 }
 
 
-def get_main_window_style():
-    """Obtener estilos para la ventana principal"""
-    return f"""
+# Plantilla de estilos para la ventana principal
+_MAIN_WINDOW_TEMPLATE = """
         QMainWindow {{
-            background-color: {THEME_COLORS['background']};
-            color: {THEME_COLORS['text_primary']};
+            background-color: {background};
+            color: {text_primary};
         }}
         
         /* === LABELS === */
         QLabel {{
-            color: {THEME_COLORS['text_primary']};
+            color: {text_primary};
             background: transparent;
         }}
         
         /* === BUTTONS === */
         QPushButton {{
-            background-color: {THEME_COLORS['button_primary']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {button_primary};
+            border: 1px solid {border_dark};
             border-radius: 4px;
-            color: {THEME_COLORS['button_text']};
+            color: {button_text};
             font-weight: bold;
             font-size: 11px;
             padding: 8px 16px;
@@ -83,39 +83,39 @@ def get_main_window_style():
         }}
         
         QPushButton:hover {{
-            background-color: {THEME_COLORS['button_hover']};
+            background-color: {button_hover};
         }}
         
         QPushButton:pressed {{
-            background-color: {THEME_COLORS['button_secondary']};
+            background-color: {button_secondary};
         }}
         
         QPushButton:default {{
-            border: 2px solid {THEME_COLORS['accent_primary']};
+            border: 2px solid {accent_primary};
         }}
         
         QPushButton:disabled {{
-            background-color: {THEME_COLORS['border_dark']};
-            color: {THEME_COLORS['text_secondary']};
-            border-color: {THEME_COLORS['border_dark']};
+            background-color: {border_dark};
+            color: {text_secondary};
+            border-color: {border_dark};
         }}
         
         /* === HEADER WIDGET === */
         QWidget#headerWidget {{
-            background-color: {THEME_COLORS['background']};
+            background-color: {background};
             border: none;
             max-height: 80px;
             min-height: 68px;
         }}
         
         QLabel#titleLabel {{
-            color: {THEME_COLORS['text_primary']};
+            color: {text_primary};
             font-weight: bold;
             background: transparent;
         }}
         
         QLabel#countLabel {{
-            color: {THEME_COLORS['text_secondary']};
+            color: {text_secondary};
             background: transparent;
         }}
         
@@ -128,10 +128,10 @@ def get_main_window_style():
         /* Estilos aplicados inline en TransparentWidget.apply_transparent_style() */
         
         QPushButton#headerButton {{
-            background-color: {THEME_COLORS['button_primary']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {button_primary};
+            border: 1px solid {border_dark};
             border-radius: 4px;
-            color: {THEME_COLORS['button_text']};
+            color: {button_text};
             font-weight: bold;
             font-size: 11px;
             padding: 8px 16px;
@@ -140,19 +140,19 @@ def get_main_window_style():
         }}
         
         QPushButton#headerButton:hover {{
-            background-color: {THEME_COLORS['button_hover']};
-            border: 1px solid {THEME_COLORS['border_light']};
+            background-color: {button_hover};
+            border: 1px solid {border_light};
         }}
         
         QPushButton#headerButton:pressed {{
-            background-color: {THEME_COLORS['button_secondary']};
+            background-color: {button_secondary};
         }}
         
         /* === MENU BAR === */
         QMenuBar {{
-            background-color: {THEME_COLORS['card_background']};
-            color: {THEME_COLORS['text_primary']};
-            border-bottom: 2px solid {THEME_COLORS['border_dark']};
+            background-color: {card_background};
+            color: {text_primary};
+            border-bottom: 2px solid {border_dark};
             padding: 2px;
         }}
         
@@ -164,18 +164,18 @@ def get_main_window_style():
         }}
         
         QMenuBar::item:selected {{
-            background-color: {THEME_COLORS['button_primary']};
+            background-color: {button_primary};
         }}
         
         QMenuBar::item:pressed {{
-            background-color: {THEME_COLORS['button_secondary']};
+            background-color: {button_secondary};
         }}
         
         /* === MENU === */
         QMenu {{
-            background-color: {THEME_COLORS['card_background']};
-            color: {THEME_COLORS['text_primary']};
-            border: 2px solid {THEME_COLORS['border_dark']};
+            background-color: {card_background};
+            color: {text_primary};
+            border: 2px solid {border_dark};
             border-radius: 6px;
             padding: 4px;
         }}
@@ -187,29 +187,29 @@ def get_main_window_style():
         }}
         
         QMenu::item:selected {{
-            background-color: {THEME_COLORS['button_primary']};
+            background-color: {button_primary};
         }}
         
         QMenu::separator {{
             height: 1px;
-            background-color: {THEME_COLORS['border_dark']};
+            background-color: {border_dark};
             margin: 4px 8px;
         }}
         
         /* === TOOLBAR === */
         QToolBar {{
-            background-color: {THEME_COLORS['card_background']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {card_background};
+            border: 1px solid {border_dark};
             border-radius: 4px;
             spacing: 8px;
             padding: 8px;
         }}
         
         QToolBar QToolButton {{
-            background-color: {THEME_COLORS['button_primary']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {button_primary};
+            border: 1px solid {border_dark};
             border-radius: 6px;
-            color: {THEME_COLORS['text_primary']};
+            color: {text_primary};
             font-weight: bold;
             padding: 8px;
             min-width: 60px;
@@ -217,14 +217,14 @@ def get_main_window_style():
         }}
         
         QToolBar QToolButton:hover {{
-            background-color: {THEME_COLORS['button_hover']};
+            background-color: {button_hover};
         }}
         
         /* === STATUS BAR === */
         QStatusBar {{
-            background-color: {THEME_COLORS['card_background']};
-            color: {THEME_COLORS['text_secondary']};
-            border-top: 2px solid {THEME_COLORS['border_dark']};
+            background-color: {card_background};
+            color: {text_secondary};
+            border-top: 2px solid {border_dark};
             padding: 4px;
         }}
         
@@ -235,20 +235,20 @@ def get_main_window_style():
         }}
         
         QScrollBar:vertical {{
-            background-color: {THEME_COLORS['card_background']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {card_background};
+            border: 1px solid {border_dark};
             border-radius: 6px;
             width: 12px;
         }}
         
         QScrollBar::handle:vertical {{
-            background-color: {THEME_COLORS['button_primary']};
+            background-color: {button_primary};
             border-radius: 5px;
             min-height: 20px;
         }}
         
         QScrollBar::handle:vertical:hover {{
-            background-color: {THEME_COLORS['button_hover']};
+            background-color: {button_hover};
         }}
         
         QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
@@ -258,73 +258,72 @@ def get_main_window_style():
     """
 
 
-def get_character_card_style():
-    """
-    Obtener estilos para las tarjetas de personajes.
-    NOTA: La transparencia se aplica directamente con rgba() que funciona en Qt 6+
-    """
-    return f"""
+# Plantilla de estilos para las tarjetas de personajes.
+# NOTA: La transparencia se aplica directamente con rgba() que funciona en Qt 6+
+#
+# Los selectores están acotados a CharacterCard para poder aplicar la hoja
+# una sola vez en el contenedor de tarjetas en lugar de en cada tarjeta.
+_CHARACTER_CARD_TEMPLATE = """
         /* === TARJETA BASE CON TRANSPARENCIA === */
         CharacterCard {{
             background-color: rgba(74, 74, 74, 51);  /* 20% opacidad */
-            border: 1px solid {THEME_COLORS['border_dark']};
+            border: 1px solid {border_dark};
             border-radius: 6px;
             margin: 4px;
             padding: 0px;
         }}
         
         CharacterCard:hover {{
-            border-color: {THEME_COLORS['accent_primary']};
+            border-color: {accent_primary};
         }}
         
         /* === CONTENEDORES INTERNOS === */
-        QFrame[frameShape="4"] {{  
+        CharacterCard QFrame[frameShape="4"] {{  
             /* Stats panel y image container */
             background-color: transparent;
-            border: 1px solid {THEME_COLORS['border_light']};
+            border: 1px solid {border_light};
             border-radius: 4px;
         }}
         
         /* === LABELS === */
-        QLabel {{
-            color: {THEME_COLORS['text_primary']};
+        CharacterCard QLabel {{
+            color: {text_primary};
             background: transparent;
         }}
         
         /* === BOTONES === */
-        QPushButton {{
-            background-color: {THEME_COLORS['button_secondary']};
-            border: 1px solid {THEME_COLORS['border_light']};
+        CharacterCard QPushButton {{
+            background-color: {button_secondary};
+            border: 1px solid {border_light};
             border-radius: 3px;
-            color: {THEME_COLORS['button_text']};
+            color: {button_text};
             font-weight: bold;
             font-size: 11px;
             padding: 6px 12px;
         }}
         
-        QPushButton:hover {{
-            background-color: {THEME_COLORS['button_hover']};
+        CharacterCard QPushButton:hover {{
+            background-color: {button_hover};
         }}
         
-        QPushButton:pressed {{
-            background-color: {THEME_COLORS['button_primary']};
+        CharacterCard QPushButton:pressed {{
+            background-color: {button_primary};
         }}
     """
 
 
-def get_character_form_style():
-    """Obtener estilos para el formulario de personajes"""
-    return f"""
+# Plantilla de estilos para el formulario de personajes
+_CHARACTER_FORM_TEMPLATE = """
         QDialog {{
-            background-color: {THEME_COLORS['background']};
-            color: {THEME_COLORS['text_primary']};
+            background-color: {background};
+            color: {text_primary};
         }}
         
         /* === GROUP BOXES === */
         QGroupBox {{
             font-weight: bold;
             font-size: 12px;
-            border: 2px solid {THEME_COLORS['border_dark']};
+            border: 2px solid {border_dark};
             border-radius: 6px;
             margin-top: 1ex;
             padding-top: 15px;
@@ -334,56 +333,56 @@ def get_character_form_style():
             subcontrol-origin: margin;
             left: 15px;
             padding: 0 8px;
-            color: {THEME_COLORS['accent_primary']};
-            background-color: {THEME_COLORS['card_background']};
+            color: {accent_primary};
+            background-color: {card_background};
             border-radius: 4px;
         }}
         
         /* === INPUT FIELDS === */
         QLineEdit {{
-            background-color: {THEME_COLORS['card_background']};
-            border: 1px solid {THEME_COLORS['border_light']};
+            background-color: {card_background};
+            border: 1px solid {border_light};
             border-radius: 4px;
             padding: 6px;
-            color: {THEME_COLORS['text_primary']};
+            color: {text_primary};
             font-size: 12px;
-            selection-background-color: {THEME_COLORS['accent_primary']};
+            selection-background-color: {accent_primary};
         }}
         
         QLineEdit:focus {{
-            border-color: {THEME_COLORS['accent_primary']};
+            border-color: {accent_primary};
         }}
         
         QSpinBox {{
-            background-color: {THEME_COLORS['card_background']};
-            border: 1px solid {THEME_COLORS['border_light']};
+            background-color: {card_background};
+            border: 1px solid {border_light};
             border-radius: 4px;
             padding: 4px 8px;
-            color: {THEME_COLORS['text_primary']};
+            color: {text_primary};
             font-size: 11px;
             font-weight: bold;
         }}
         
         QSpinBox:focus {{
-            border-color: {THEME_COLORS['accent_primary']};
+            border-color: {accent_primary};
         }}
         
         QSpinBox::up-button, QSpinBox::down-button {{
-            background-color: {THEME_COLORS['button_primary']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {button_primary};
+            border: 1px solid {border_dark};
             width: 16px;
         }}
         
         QSpinBox::up-button:hover, QSpinBox::down-button:hover {{
-            background-color: {THEME_COLORS['button_hover']};
+            background-color: {button_hover};
         }}
         
         /* === BUTTONS === */
         QPushButton {{
-            background-color: {THEME_COLORS['button_primary']};
-            border: 1px solid {THEME_COLORS['border_dark']};
+            background-color: {button_primary};
+            border: 1px solid {border_dark};
             border-radius: 4px;
-            color: {THEME_COLORS['button_text']};
+            color: {button_text};
             font-weight: bold;
             font-size: 11px;
             padding: 8px 16px;
@@ -391,38 +390,45 @@ def get_character_form_style():
         }}
         
         QPushButton:hover {{
-            background-color: {THEME_COLORS['button_hover']};
+            background-color: {button_hover};
         }}
         
         QPushButton:pressed {{
-            background-color: {THEME_COLORS['button_secondary']};
+            background-color: {button_secondary};
         }}
         
         QPushButton:default {{
-            border-color: {THEME_COLORS['accent_primary']};
+            border-color: {accent_primary};
         }}
         
         /* === LABELS === */
         QLabel {{
-            color: {THEME_COLORS['text_primary']};
+            color: {text_primary};
             background: transparent;
         }}
         
         /* Image preview frame */
         QLabel[frameShape="4"] {{
-            background-color: {THEME_COLORS['card_background']};
-            border: 2px dashed {THEME_COLORS['border_light']};
+            background-color: {card_background};
+            border: 2px dashed {border_light};
             border-radius: 6px;
         }}
+        
+        /* === LISTA DE COMPETENCIAS === */
+        QWidget#proficiencyList QLabel[role="statTitle"] {{
+            color: {text_primary};
+            margin-top: 10px;
+        }}
+        
+        QWidget#proficiencyList QCheckBox {{
+            margin-left: 20px;
+        }}
     """
 
 
-def get_character_grid_style():
-    """
-    Estilos para el grid de personajes.
-    IMPORTANTE: Usa fondos transparentes para permitir ver el fondo de la ventana
-    """
-    return f"""
+# Plantilla de estilos para el grid de personajes.
+# IMPORTANTE: Usa fondos transparentes para permitir ver el fondo de la ventana
+_CHARACTER_GRID_TEMPLATE = """
         /* === GRID PRINCIPAL === */
         CharacterGrid {{
             background: transparent;
@@ -431,17 +437,17 @@ def get_character_grid_style():
         /* === EMPTY STATE === */
         QFrame[frameShape="4"] {{  /* Empty state frame */
             background-color: rgba(0, 0, 0, 102);  /* 40% opacidad */
-            border: 2px dashed {THEME_COLORS['border_light']};
+            border: 2px dashed {border_light};
             border-radius: 8px;
             margin: 30px;
         }}
         
         QFrame[frameShape="4"]:hover {{
-            border-color: {THEME_COLORS['accent_primary']};
+            border-color: {accent_primary};
         }}
         
         QLabel {{
-            color: {THEME_COLORS['text_accent']};
+            color: {text_accent};
         }}
         
         /* === SCROLL AREA - TRANSPARENTE === */
@@ -456,6 +462,42 @@ def get_character_grid_style():
     """
 
 
+# Las hojas de estilo son constantes durante toda la ejecución: se generan una
+# sola vez al importar el módulo (un format_map por plantilla) y los getters
+# devuelven el mismo string
+_MAIN_WINDOW_STYLE = _MAIN_WINDOW_TEMPLATE.format_map(THEME_COLORS)
+_CHARACTER_CARD_STYLE = _CHARACTER_CARD_TEMPLATE.format_map(THEME_COLORS)
+_CHARACTER_FORM_STYLE = _CHARACTER_FORM_TEMPLATE.format_map(THEME_COLORS)
+_CHARACTER_GRID_STYLE = _CHARACTER_GRID_TEMPLATE.format_map(THEME_COLORS)
+
+_STYLES = {
+    'main': _MAIN_WINDOW_STYLE,
+    'card': _CHARACTER_CARD_STYLE,
+    'form': _CHARACTER_FORM_STYLE,
+    'grid': _CHARACTER_GRID_STYLE,
+}
+
+
+def get_main_window_style():
+    """Obtener estilos para la ventana principal"""
+    return _MAIN_WINDOW_STYLE
+
+
+def get_character_card_style():
+    """Obtener estilos para las tarjetas de personajes (acotados a CharacterCard)"""
+    return _CHARACTER_CARD_STYLE
+
+
+def get_character_form_style():
+    """Obtener estilos para el formulario de personajes"""
+    return _CHARACTER_FORM_STYLE
+
+
+def get_character_grid_style():
+    """Obtener estilos para el grid de personajes (fondos transparentes)"""
+    return _CHARACTER_GRID_STYLE
+
+
 def apply_theme_to_widget(widget, widget_type="main"):
     """
     Aplicar tema a un widget específico
@@ -464,15 +506,9 @@ def apply_theme_to_widget(widget, widget_type="main"):
         widget: Widget al que aplicar el tema
         widget_type: Tipo de widget ('main', 'card', 'form', 'grid')
     """
-    styles = {
-        'main': get_main_window_style(),
-        'card': get_character_card_style(),
-        'form': get_character_form_style(),
-        'grid': get_character_grid_style()
-    }
-    
-    if widget_type in styles:
-        widget.setStyleSheet(styles[widget_type])
+    style = _STYLES.get(widget_type)
+    if style is not None:
+        widget.setStyleSheet(style)
 
 
 # Fuentes personalizadas para el tema
@@ -5,6 +5,7 @@ Aplicación de escritorio para gestión de personajes de juegos de rol
 Author: RollForge Team
 """
 
+import logging
 import sys
 import os
 
@@ -13,12 +14,15 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'dnd_dm_app'))
 
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QIcon
 from gui.main_window import MainWindow
 
 
 def main():
     """Función principal de la aplicación"""
+    # Configurar logging una sola vez para toda la aplicación
+    logging.basicConfig(level=logging.INFO)
+    
     # Configurar variables de entorno para DPI alto ANTES de Qt
     os.environ['QT_AUTO_SCREEN_SCALE_FACTOR'] = '1'
     
@@ -42,14 +46,9 @@ def main():
     # Establecer el ícono de la aplicación (para barra de tareas y ventana)
     dragon_icon_path = os.path.join(os.path.dirname(__file__), "assets", "dragon.png")
     if os.path.exists(dragon_icon_path):
-        icon = QIcon()
-        pixmap = QPixmap(dragon_icon_path)
-        # Agregar múltiples tamaños para mejor calidad en diferentes contextos
-        for size in [16, 32, 48, 64, 128, 256]:
-            scaled = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, 
-                                  Qt.TransformationMode.SmoothTransformation)
-            icon.addPixmap(scaled)
-        app.setWindowIcon(icon)
+        # QIcon desde archivo: Qt genera cada tamaño (barra de tareas, ventana...)
+        # solo cuando se pide, en lugar de escalar 6 tamaños antes de mostrar la ventana
+        app.setWindowIcon(QIcon(dragon_icon_path))
     
     # Crear y mostrar la ventana principal
     main_window = MainWindow()